@@ -14,18 +14,19 @@ Usage:
     python generate_hwpx.py --output output.hwpx --config config.json
 """
 
-import argparse
 import hashlib
+import io
 import json
 import math
 import os
 import re
-import shutil
-import tempfile
+import sys
 import zipfile
-from datetime import datetime
+from datetime import datetime, timezone
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate, islice
 from pathlib import Path
-from xml.sax.saxutils import escape as xml_escape
 from xml.etree import ElementTree as ET
 
 from . import _parser
@@ -56,6 +57,12 @@ NS_DECL = (
     'xmlns:config="urn:oasis:names:tc:opendocument:xmlns:config:1.0"'
 )
 
+# Section root for generated (non-template) sections. Hancom Office expects
+# the full namespace set on every <hs:sec>, so it is not pruned per section;
+# it is rendered once here rather than per section.
+_SEC_OPEN = f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><hs:sec {NS_DECL}>'
+_SEC_CLOSE = '</hs:sec>'
+
 # Page dimensions (A4, matching template)
 PAGE_WIDTH = 59528
 PAGE_HEIGHT = 84188
@@ -71,22 +78,42 @@ HORZSIZE_DEFAULT = 48188
 # Lineseg flags
 FLAGS_FIRST_LINE = 393216       # 0x60000 - first or only line
 FLAGS_CONTINUATION = 1441792    # 0x160000 - continuation line (2nd, 3rd, ...)
+_FLAGS_FIRST_LINE_S = str(FLAGS_FIRST_LINE)      # pre-rendered for lineseg_xml
+_FLAGS_CONTINUATION_S = str(FLAGS_CONTINUATION)
 
 # 6-point empty line between bullet level changes (□↔ㅇ)
 BULLET_TRANSITION_SPACER_HEIGHT = 600   # 6pt in HWPX units (100 units = 1pt)
 
+# XML text escaping. Most run text has no markup characters, so three
+# C-level substring checks short-circuit the common case and return the text
+# without allocating; otherwise one translate pass replaces all three
+# (saxutils.escape does three str.replace passes).
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+
+def xml_escape(s):
+    """Escape ``&``, ``<`` and ``>`` in ``s`` (drop-in for saxutils.escape)."""
+    if '&' in s or '<' in s or '>' in s:
+        return s.translate(_ESCAPE_TABLE)
+    return s
+
 
 # ============================================================================
 # Text Width Estimation & Line Count
 # ============================================================================
 
+@lru_cache(maxsize=4096)
 def estimate_text_width(text, char_height):
     """
     Estimate rendered width of text in HWPX units.
     Calibrated against real HWPX files: ~37-41 mixed Korean/ASCII chars
     fit in 48188 horzsize at 15pt (char_height=1500).
     """
-    return sum(_char_width(ch, char_height) for ch in text)
+    table = _width_table(char_height)
+    try:
+        return sum(map(table.__getitem__, _code_points(text)))
+    except IndexError:  # astral-plane characters fall outside the BMP table
+        return sum(_char_width(ch, char_height) for ch in text)
 
 
 # Minimum table column width (~2 Korean glyphs + L/R cell margins) in HWPUNIT.
@@ -107,11 +134,14 @@ def _compute_column_widths(headers, rows, char_height, total_width,
     n = len(headers)
     if n == 0:
         return []
-    intrinsic = []
-    for j in range(n):
-        texts = [headers[j]] + [str(r[j]) for r in rows if j < len(r)]
-        w = max((estimate_text_width(t, char_height) for t in texts), default=0)
-        intrinsic.append(max(min_col_width, w + h_margin))
+    # One row-major pass over the cells (no per-column text lists).
+    widest = [estimate_text_width(h, char_height) for h in headers]
+    for r in rows:
+        for j, cell in enumerate(r[:n]):
+            w = estimate_text_width(str(cell), char_height)
+            if w > widest[j]:
+                widest[j] = w
+    intrinsic = [max(min_col_width, w + h_margin) for w in widest]
 
     widths = [0] * n
     fixed = [False] * n
@@ -149,18 +179,63 @@ BOLD_WIDTH_FACTOR = 1.1
 
 def _char_width(ch, char_height, bold=False):
     """Get estimated rendered width of a single character."""
-    if '\uAC00' <= ch <= '\uD7A3':      return char_height  # Korean syllables
-    elif '\u3131' <= ch <= '\u318E':     return char_height  # Korean jamo
-    elif '\u2500' <= ch <= '\u257F':     return char_height  # Box drawing
-    elif '\uFF00' <= ch <= '\uFFEF':     return char_height  # Fullwidth forms
-    elif ord(ch) >= 0x2E80:              return char_height  # CJK, symbols
-    elif ch == ' ':                      return int(char_height * 0.25)
-    elif ch.isascii() and (ch.isalpha() or ch.isdigit()):
-        w = char_height * 0.50
-        return int(w * BOLD_WIDTH_FACTOR) if bold else int(w)
+    o = ord(ch)
+    # ASCII first: spaces, digits, Latin letters and punctuation make up much
+    # of even Korean text, and this skips every CJK range test for them.
+    if o < 0x80:
+        if o == 0x20:
+            return int(char_height * 0.25)
+        w = char_height * (0.50 if ch.isalnum() else 0.55)
+    elif o >= 0x2E80 or 0x2500 <= o <= 0x257F:
+        # Korean syllables/jamo, fullwidth forms, CJK and symbols; box drawing
+        return char_height
     else:
         w = char_height * 0.55
-        return int(w * BOLD_WIDTH_FACTOR) if bold else int(w)
+    return int(w * BOLD_WIDTH_FACTOR) if bold else int(w)
+
+
+# _char_width for every BMP code point, per (char_height, bold). Documents use
+# a handful of heights, so per-character measuring becomes one list index.
+# A list rather than array('i'): indexing it returns the stored int objects
+# instead of boxing a new one, which measured about twice as fast.
+_WIDTH_TABLE_SIZE = 0x10000
+
+
+@lru_cache(maxsize=32)
+def _width_table(char_height, bold=False):
+    """List of _char_width(chr(o), char_height, bold) for o in the BMP."""
+    full = _char_width('\uAC00', char_height, bold)
+    table = [_char_width('\u0080', char_height, bold)] * _WIDTH_TABLE_SIZE
+    table[:0x80] = [_char_width(chr(o), char_height, bold) for o in range(0x80)]
+    table[0x2500:0x2580] = [full] * 0x80
+    table[0x2E80:] = [full] * (_WIDTH_TABLE_SIZE - 0x2E80)
+    return table
+
+
+# Longer strings are decoded to code points in one C-level pass (UTF-32 in
+# native byte order, viewed as unsigned ints) instead of an ord() call per
+# character; below this length the encode costs more than it saves.
+_BULK_DECODE_MIN = 32
+_UTF32_NATIVE = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def _code_points(text):
+    """Iterable of the code points of ``text``."""
+    if len(text) >= _BULK_DECODE_MIN:
+        try:
+            return memoryview(text.encode(_UTF32_NATIVE)).cast('I')
+        except UnicodeEncodeError:  # lone surrogates
+            pass
+    return map(ord, text)
+
+
+def _char_widths(text, char_height, bold=False):
+    """List of the _char_width() of each character in ``text``."""
+    table = _width_table(char_height, bold)
+    try:
+        return list(map(table.__getitem__, _code_points(text)))
+    except IndexError:  # astral-plane characters fall outside the BMP table
+        return [_char_width(ch, char_height, bold) for ch in text]
 
 
 # Effective width ratio: 91% of horzsize matches Hancom's rendering.
@@ -175,8 +250,7 @@ def estimate_line_count(text, char_height, horzsize=HORZSIZE_DEFAULT):
     """
     if not text:
         return 1
-    breaks = estimate_line_breaks(text, char_height, horzsize)
-    return len(breaks)
+    return len(_line_breaks(text, char_height, horzsize))
 
 
 def estimate_chars_per_line(text, char_height, horzsize=HORZSIZE_DEFAULT):
@@ -199,32 +273,59 @@ def estimate_line_breaks(text, char_height, horzsize=HORZSIZE_DEFAULT):
 
     Uses 91% of horzsize as effective width, calibrated against Hancom.
     """
-    if not text:
-        return [0]
+    return list(_line_breaks(text, char_height, horzsize))
 
+
+# A paragraph's breaks are needed twice (line count for the vertical position,
+# then the lineseg textpos values) and table cells repeat short strings, so
+# results are memoized as tuples; estimate_line_breaks hands out list copies.
+@lru_cache(maxsize=4096)
+def _line_breaks(text, char_height, horzsize):
+    """Tuple form of :func:`estimate_line_breaks`."""
+    if not text or _fits_one_line(text, char_height, horzsize):
+        return (0,)
+    return tuple(_wrap_breaks(text, _char_widths(text, char_height), horzsize))
+
+
+def _fits_one_line(text, char_height, horzsize):
+    """True when ``text`` cannot overflow the line whatever its characters.
+
+    No glyph is wider than ``char_height`` (full-width), so this length bound
+    settles most labels and table cells without measuring them.
+    """
+    return len(text) * char_height <= int(horzsize * EFFECTIVE_WIDTH_RATIO)
+
+
+def _wrap_breaks(text, widths, horzsize):
+    """Greedy word-wrap line starts of ``text`` given each character's width.
+
+    Running widths: the current line overflows at the first i with
+    cw[i] > limit, where limit = effective width + the cumulative width before
+    the line's first character. Widths are non-negative, so cw is sorted and
+    each overflow is found by bisection rather than a walk over the line.
+    """
     effective_width = int(horzsize * EFFECTIVE_WIDTH_RATIO)
     breaks = [0]  # First line always starts at 0
-    cumulative_width = 0
-    last_space_pos = None  # Position AFTER the last space (= start of next word)
-
-    for i, ch in enumerate(text):
-        w = _char_width(ch, char_height)
-        cumulative_width += w
-
-        if ch == ' ':
-            last_space_pos = i + 1  # Next line would start after this space
-
-        if cumulative_width > effective_width:
-            if last_space_pos and last_space_pos > breaks[-1]:
-                # Word wrap: break at the last space boundary
-                breaks.append(last_space_pos)
-                # Recalculate cumulative width from the break point
-                cumulative_width = sum(_char_width(c, char_height) for c in text[last_space_pos:i+1])
-            elif i > breaks[-1]:
-                # No space found: break at current character
-                breaks.append(i)
-                cumulative_width = w
-            last_space_pos = None  # Reset for next line
+    cw = list(accumulate(widths))
+    n = len(cw)
+    limit = effective_width
+    scan_from = 0  # spaces before this index were seen at an earlier overflow
+    i = bisect_right(cw, limit)
+
+    while i < n:
+        # Word wrap: break after the last space since the previous overflow
+        space = text.rfind(' ', scan_from, i + 1)
+        if space >= 0 and space + 1 > breaks[-1]:
+            breaks.append(space + 1)
+            limit = cw[space] + effective_width
+        elif i > breaks[-1]:
+            # No space found: break at current character
+            breaks.append(i)
+            limit = cw[i - 1] + effective_width
+        # Spaces up to i are spent; the next overflow is checked after i even
+        # if the carried-over word alone is still too wide.
+        scan_from = i + 1
+        i = bisect_right(cw, limit, scan_from)
 
     return breaks
 
@@ -236,27 +337,13 @@ def _segmented_line_count(segments, char_height, horzsize=HORZSIZE_DEFAULT):
     its width. For all-normal segments this equals estimate_line_count() on the
     joined text.
     """
-    chars = [(ch, bold) for text, bold in segments for ch in text]
-    if not chars:
+    text = ''.join(t for t, _bold in segments)
+    if not text or _fits_one_line(text, char_height, horzsize):
         return 1
-    effective_width = int(horzsize * EFFECTIVE_WIDTH_RATIO)
-    breaks = [0]
-    cumulative_width = 0
-    last_space_pos = None
-    for i, (ch, bold) in enumerate(chars):
-        cumulative_width += _char_width(ch, char_height, bold)
-        if ch == ' ':
-            last_space_pos = i + 1
-        if cumulative_width > effective_width:
-            if last_space_pos and last_space_pos > breaks[-1]:
-                breaks.append(last_space_pos)
-                cumulative_width = sum(_char_width(c, char_height, b)
-                                       for c, b in chars[last_space_pos:i + 1])
-            elif i > breaks[-1]:
-                breaks.append(i)
-                cumulative_width = _char_width(ch, char_height, bold)
-            last_space_pos = None
-    return len(breaks)
+    widths = []
+    for t, bold in segments:
+        widths += _char_widths(t, char_height, bold)
+    return len(_wrap_breaks(text, widths, horzsize))
 
 
 # ============================================================================
@@ -272,27 +359,18 @@ class VertPosTracker:
     For N lines:     total_height = N * vertsize + (N-1) * spacing
 
     Next paragraph: vertpos = prev_vertpos + prev_total_height + prev_spacing
+                           = prev_vertpos + N * (vertsize + spacing)
     """
+    __slots__ = ('_next',)
+
     def __init__(self):
-        self._pos = 0
-        self._last_total_height = 0
-        self._last_spacing = 0
-        self._first = True
+        self._next = 0
 
     def next(self, vertsize, spacing, num_lines=1):
         """Advance position and return the vertpos for this paragraph's first line."""
-        if self._first:
-            self._first = False
-            vp = 0
-        else:
-            vp = self._pos + self._last_total_height + self._last_spacing
-        self._pos = vp
-        # Total height consumed by this paragraph (all lines)
-        if num_lines > 1:
-            self._last_total_height = num_lines * vertsize + (num_lines - 1) * spacing
-        else:
-            self._last_total_height = vertsize
-        self._last_spacing = spacing
+        vp = self._next
+        # Total height of this paragraph's lines plus the gap after it
+        self._next = vp + (num_lines if num_lines > 1 else 1) * (vertsize + spacing)
         return vp
 
     def reset(self):
@@ -413,73 +491,117 @@ def save_style_map_cache(cache_path, hash_val, style_map):
         print(f"Warning: Could not save style map cache: {e}")
 
 
-def _parse_header_catalogs(header_xml_path):
+_HH = '{http://www.hancom.co.kr/hwpml/2011/head}'
+
+
+class _HeaderCatalogTarget:
+    """XMLParser target collecting the font, charPr and paraPr catalogs.
+
+    Only start/end events are handled, so the parser never builds an element
+    tree. Child lookups mirror the old ``find`` semantics: fontRef, bold and
+    align are read from direct children (first one wins), while lineSpacing
+    may sit under <hp:switch>/<hp:default>, so the last descendant wins (the
+    default branch is typically last, matching what older Hancom builds read).
+    """
+
+    __slots__ = ('font_map', 'char_refs', 'para_catalog',
+                 '_depth', '_lang', '_cp', '_cp_depth', '_pp', '_pp_depth',
+                 '_pp_align_seen')
+
+    def __init__(self):
+        self.font_map = {}
+        self.char_refs = {}
+        self.para_catalog = {}
+        self._depth = 0
+        self._lang = None
+        self._cp = None
+        self._cp_depth = 0
+        self._pp = None
+        self._pp_depth = 0
+        self._pp_align_seen = False
+
+    def start(self, tag, attrib):
+        depth = self._depth = self._depth + 1
+        if not tag.startswith(_HH):
+            return
+        name = tag[len(_HH):]
+        if name == 'font':
+            if self._lang is not None:
+                self.font_map[(self._lang, attrib.get('id', ''))] = attrib.get('face', '')
+        elif name == 'fontface':
+            self._lang = attrib.get('lang', '')
+        elif name == 'charPr':
+            # [height, hangul font ref, bold, fontRef seen]
+            self._cp = [int(attrib.get('height', '0')), '0', False, False]
+            self._cp_depth = depth
+            self.char_refs[attrib.get('id', '')] = self._cp
+        elif name == 'paraPr':
+            self._pp = {
+                'align': 'JUSTIFY',
+                'line_spacing_type': 'PERCENT',
+                'line_spacing_value': '160',
+            }
+            self._pp_depth = depth
+            self._pp_align_seen = False
+            self.para_catalog[attrib.get('id', '')] = self._pp
+        elif self._cp is not None and depth == self._cp_depth + 1:
+            if name == 'fontRef' and not self._cp[3]:
+                self._cp[1] = attrib.get('hangul', '0')
+                self._cp[3] = True
+            elif name == 'bold':
+                self._cp[2] = True
+        elif self._pp is not None:
+            if name == 'lineSpacing':
+                self._pp['line_spacing_type'] = attrib.get('type', 'PERCENT')
+                self._pp['line_spacing_value'] = attrib.get('value', '160')
+            elif name == 'align' and depth == self._pp_depth + 1 and not self._pp_align_seen:
+                self._pp['align'] = attrib.get('horizontal', 'JUSTIFY')
+                self._pp_align_seen = True
+
+    def end(self, tag):
+        depth = self._depth
+        self._depth = depth - 1
+        if self._cp is not None and depth == self._cp_depth:
+            self._cp = None
+        elif self._pp is not None and depth == self._pp_depth:
+            self._pp = None
+        elif tag == _HH + 'fontface':
+            self._lang = None
+
+    def close(self):
+        return self
+
+
+def _parse_header_catalogs(header_xml_path, header_xml=None):
     """Parse header.xml to build charPr and paraPr catalogs.
 
+    Pass ``header_xml`` (the file's text) to parse from memory; ``header_xml_path``
+    is then ignored.
+
     Returns (char_catalog, para_catalog) where:
       char_catalog: {id_str: {'height': int, 'face': str, 'bold': bool}}
       para_catalog: {id_str: {'align': str, 'line_spacing_type': str, 'line_spacing_value': str}}
     Returns (None, None) on failure.
     """
     try:
-        ns = {
-            'hh': 'http://www.hancom.co.kr/hwpml/2011/head',
-            'hc': 'http://www.hancom.co.kr/hwpml/2011/core',
-        }
-        tree = ET.parse(header_xml_path)
-        root = tree.getroot()
-
-        # Build font ID -> face name map
-        font_map = {}
-        for fontface in root.findall('.//hh:fontface', ns):
-            lang = fontface.get('lang', '')
-            for font in fontface.findall('hh:font', ns):
-                fid = font.get('id', '')
-                face = font.get('face', '')
-                font_map[(lang, fid)] = face
-
-        # Build charPr catalog
-        char_catalog = {}
-        for cp in root.findall('.//hh:charPr', ns):
-            cpid = cp.get('id', '')
-            height = int(cp.get('height', '0'))
-            font_ref = cp.find('hh:fontRef', ns)
-            hangul_ref = font_ref.get('hangul', '0') if font_ref is not None else '0'
-            has_bold = cp.find('hh:bold', ns) is not None
-            hangul_face = font_map.get(('HANGUL', hangul_ref), '')
-            char_catalog[cpid] = {
+        if header_xml is None:
+            header_xml = Path(header_xml_path).read_bytes()
+        parser = ET.XMLParser(target=_HeaderCatalogTarget())
+        parser.feed(header_xml)
+        target = parser.close()
+
+        # charPr faces are resolved after parsing so the result doesn't depend
+        # on fontfaces preceding charProperties in the document.
+        font_map = target.font_map
+        char_catalog = {
+            cpid: {
                 'height': height,
-                'face': hangul_face,
+                'face': font_map.get(('HANGUL', hangul_ref), ''),
                 'bold': has_bold,
             }
-
-        # Build paraPr catalog. lineSpacing lives under <hp:switch>/<hp:default>
-        # in modern templates, so search descendants and prefer the default
-        # branch's value (matches what older Hancom builds read).
-        para_catalog = {}
-        for pp in root.findall('.//hh:paraPr', ns):
-            ppid = pp.get('id', '')
-            align_el = pp.find('hh:align', ns)
-            h_align = align_el.get('horizontal', 'JUSTIFY') if align_el is not None else 'JUSTIFY'
-            ls_els = pp.findall('.//hh:lineSpacing', ns)
-            # Prefer the <hp:default> branch when present; fall back to first.
-            ls_el = None
-            for el in ls_els:
-                parent_tag = el.getparent().tag if hasattr(el, 'getparent') else None
-                if parent_tag and parent_tag.endswith('default'):
-                    ls_el = el
-                    break
-            if ls_el is None and ls_els:
-                ls_el = ls_els[-1]  # default branch is typically last
-            ls_type = ls_el.get('type', 'PERCENT') if ls_el is not None else 'PERCENT'
-            ls_value = ls_el.get('value', '160') if ls_el is not None else '160'
-            para_catalog[ppid] = {
-                'align': h_align,
-                'line_spacing_type': ls_type,
-                'line_spacing_value': ls_value,
-            }
-
-        return char_catalog, para_catalog
+            for cpid, (height, hangul_ref, has_bold, _) in target.char_refs.items()
+        }
+        return char_catalog, target.para_catalog
     except Exception as e:
         print(f"Warning: Could not parse header.xml catalogs: {e}")
         return None, None
@@ -494,6 +616,25 @@ def _charpr_canonical(charpr_xml):
     return s
 
 
+@lru_cache(maxsize=2)
+def _charpr_twin_index(header_xml):
+    """({id: charPr xml}, {canonical form: sorted ids of bold charPrs}) of a header.
+
+    Built once per header text; each bold-twin lookup is then a dict get
+    instead of a rescan of every charPr.
+    """
+    chars = {}
+    for m in re.finditer(r'<hh:charPr id="(\d+)".*?</hh:charPr>', header_xml, re.DOTALL):
+        chars[m.group(1)] = m.group(0)
+    bold_by_canon = {}
+    for cid, xml in chars.items():
+        if '<hh:bold' in xml:
+            bold_by_canon.setdefault(_charpr_canonical(xml), []).append(int(cid))
+    for ids in bold_by_canon.values():
+        ids.sort()
+    return chars, bold_by_canon
+
+
 def _find_bold_twin(header_xml, base_id):
     """Return the id of a bold charPr identical to base_id except for weight.
 
@@ -502,20 +643,14 @@ def _find_bold_twin(header_xml, base_id):
     Returns str(base_id) when no exact twin exists (caller renders normal).
     """
     base_id = str(base_id)
-    chars = {}
-    for m in re.finditer(r'<hh:charPr id="(\d+)".*?</hh:charPr>', header_xml, re.DOTALL):
-        chars[m.group(1)] = m.group(0)
+    chars, bold_by_canon = _charpr_twin_index(header_xml)
     base = chars.get(base_id)
     if base is None:
         return base_id
-    base_canon = _charpr_canonical(base)
-    matches = []
-    for cid, xml in chars.items():
-        if cid == base_id or '<hh:bold' not in xml:
-            continue
-        if _charpr_canonical(xml) == base_canon:
-            matches.append(int(cid))
-    return str(min(matches)) if matches else base_id
+    for cid in bold_by_canon.get(_charpr_canonical(base), ()):
+        if str(cid) != base_id:
+            return str(cid)
+    return base_id
 
 
 def _extract_all_top_level_paragraphs(section_xml):
@@ -759,10 +894,26 @@ def _count_body_headings(section_xml):
         paras, _ = _extract_all_top_level_paragraphs(section_xml)
     except Exception:
         return 0
-    count = 0
-    for p in paras:
-        if _MARKER_PATTERNS["heading"].match(_extract_paragraph_first_text(p)):
-            count += 1
+    return _count_heading_paragraphs(paras)
+
+
+def _count_heading_paragraphs(paras):
+    """Number of paragraphs in ``paras`` whose text starts with ``□``."""
+    heading = _MARKER_PATTERNS["heading"]
+    return sum(1 for p in paras if heading.match(_extract_paragraph_first_text(p)))
+
+
+def _section_heading_count(tx, name):
+    """Heading count of section ``name``, falling back to the legacy
+    ``styleIDRef="15"`` count when no ``□`` marker paragraph is found."""
+    try:
+        paras, _ = tx.paragraphs(name)
+    except Exception:
+        count = 0
+    else:
+        count = _count_heading_paragraphs(paras)
+    if count == 0:
+        count = tx.sections[name].count('styleIDRef="15"')
     return count
 
 
@@ -848,6 +999,122 @@ def _most_common_signature(bucket):
     return None
 
 
+def _section_number(name):
+    return int(re.search(r'(\d+)', name.rsplit('/', 1)[-1]).group(1))
+
+
+_SECTION_MEMBER_RE = re.compile(r'Contents/section[^/]*\.xml')
+
+
+class _TemplateXml:
+    """Header and section XML of a template package, held in memory.
+
+    ``header`` is the text of Contents/header.xml (None if absent) and
+    ``sections`` maps each ``Contents/sectionN.xml`` member name to its text,
+    in section-number order. Built from an extracted template directory or
+    straight from the template ZIP's members, so style discovery and the
+    section generators do not need the package unpacked on disk.
+
+    Derived data every section needs (section roles, header catalogs, the
+    skeleton paragraph split, heading counts, discovered style maps) is
+    computed on first use and kept on the instance, so one loaded template
+    serves any number of sections -- and, via _load_template, any number of
+    documents.
+    """
+
+    __slots__ = ("header", "sections", "_roles", "_catalogs", "_paragraphs",
+                 "_headings", "_style_maps", "_header_split")
+
+    def __init__(self, header, sections):
+        self.header = header
+        self.sections = sections
+        self._roles = None
+        self._catalogs = None
+        self._paragraphs = {}
+        self._headings = {}
+        self._style_maps = {}
+        self._header_split = None
+
+    def roles(self):
+        """(body_name, appendix_name) -- see _detect_template_section_names."""
+        if self._roles is None:
+            self._roles = _detect_template_section_names(self)
+        return self._roles
+
+    def header_catalogs(self):
+        """(char_catalog, para_catalog) of the header, or (None, None)."""
+        if self._catalogs is None:
+            self._catalogs = (_parse_header_catalogs(None, header_xml=self.header)
+                              if self.header is not None else (None, None))
+        return self._catalogs
+
+    def header_with_sec_cnt(self, total_sections):
+        """The header text with every secCnt set to ``total_sections``.
+
+        The header is split at its secCnt attributes once; each document then
+        only joins the pieces around its own count.
+        """
+        if self._header_split is None:
+            self._header_split = _SECCNT_RE.split(self.header)
+        return f'secCnt="{total_sections}"'.join(self._header_split)
+
+    def heading_count(self, name):
+        """_section_heading_count() of section ``name``."""
+        if name not in self._headings:
+            self._headings[name] = _section_heading_count(self, name)
+        return self._headings[name]
+
+    def style_map(self, line_spacing_band=DEFAULT_LINE_SPACING_BAND):
+        """_build_style_map() for ``line_spacing_band``, or None.
+
+        The result is shared between callers and must not be modified.
+        """
+        if line_spacing_band not in self._style_maps:
+            self._style_maps[line_spacing_band] = _build_style_map(self, line_spacing_band)
+        return self._style_maps[line_spacing_band]
+
+    def paragraphs(self, name):
+        """_extract_all_top_level_paragraphs() of section ``name``.
+
+        The result is shared between callers and must not be modified.
+        """
+        if name not in self._paragraphs:
+            self._paragraphs[name] = _extract_all_top_level_paragraphs(self.sections[name])
+        return self._paragraphs[name]
+
+    @classmethod
+    def from_dir(cls, template_dir):
+        template_dir = Path(template_dir)
+        header_path = template_dir / "Contents" / "header.xml"
+        header = header_path.read_text(encoding="utf-8") if header_path.exists() else None
+        sections = {}
+        for path in sorted(template_dir.glob("Contents/section*.xml"),
+                           key=lambda p: _section_number(p.name)):
+            try:
+                sections[f"Contents/{path.name}"] = path.read_text(encoding="utf-8")
+            except (UnicodeDecodeError, OSError):
+                continue
+        return cls(header, sections)
+
+    @classmethod
+    def from_members(cls, members):
+        """Build from a ``{member name: bytes}`` dict of a template ZIP."""
+        header = members.get("Contents/header.xml")
+        sections = {}
+        for name in sorted((n for n in members if _SECTION_MEMBER_RE.fullmatch(n)),
+                           key=_section_number):
+            try:
+                sections[name] = members[name].decode("utf-8")
+            except UnicodeDecodeError:
+                continue
+        return cls(header.decode("utf-8") if header is not None else None, sections)
+
+
+def _as_template_xml(template):
+    """Accept an extracted template directory or an already-loaded _TemplateXml."""
+    return template if isinstance(template, _TemplateXml) else _TemplateXml.from_dir(template)
+
+
 def _detect_template_sections(template_dir):
     """Detect which section files contain body and appendix content.
 
@@ -862,60 +1129,57 @@ def _detect_template_sections(template_dir):
     appendix_path falls back to body_path for single-section templates.
     """
     template_dir = Path(template_dir)
-    section_paths = sorted(template_dir.glob("Contents/section*.xml"),
-                           key=lambda p: int(re.search(r'(\d+)', p.name).group(1)))
+    body_name, appendix_name = _TemplateXml.from_dir(template_dir).roles()
+    return (template_dir / body_name if body_name else None,
+            template_dir / appendix_name if appendix_name else None)
+
 
+def _detect_template_section_names(tx):
+    """In-memory core of :func:`_detect_template_sections`.
+
+    Returns (body_name, appendix_name) as member names of ``tx.sections``.
+    """
     # Score each section
     candidates = []
-    for path in section_paths:
-        try:
-            text = path.read_text(encoding='utf-8')
-        except (UnicodeDecodeError, OSError):
-            continue
+    for name, text in tx.sections.items():
         # Prefer marker-based heading detection (□); fall back to the legacy
         # styleIDRef="15" count for older templates that used that style.
-        heading_count = _count_body_headings(text)
-        if heading_count == 0:
-            heading_count = len(re.findall(r'styleIDRef="15"', text))
+        heading_count = tx.heading_count(name)
         has_colpr = '<hp:colPr' in text
         has_appendix_bar = bool(re.search(r'colCnt="3".*?rowCnt="1"', text, re.DOTALL)
                                 or re.search(r'rowCnt="1".*?colCnt="3"', text, re.DOTALL))
         candidates.append({
-            'path': path, 'headings': heading_count,
+            'name': name, 'headings': heading_count,
             'has_colpr': has_colpr, 'has_appendix_bar': has_appendix_bar,
         })
 
     # Body: section with most styleIDRef="15" headings (must have some)
-    body_path = None
+    body_name = None
     body_candidates = [c for c in candidates if c['headings'] > 0]
     if body_candidates:
-        body_path = max(body_candidates, key=lambda c: c['headings'])['path']
+        body_name = max(body_candidates, key=lambda c: c['headings'])['name']
 
     # Appendix: section with colPr + 1x3 table, not the body section
-    appendix_path = None
+    appendix_name = None
     for c in candidates:
-        if c['path'] == body_path:
+        if c['name'] == body_name:
             continue
         if c['has_colpr'] and c['has_appendix_bar']:
-            appendix_path = c['path']
+            appendix_name = c['name']
             break
 
     # Fallback for legacy templates
-    if body_path is None:
-        fallback = template_dir / "Contents" / "section1.xml"
-        if fallback.exists():
-            body_path = fallback
-    if appendix_path is None:
-        fallback = template_dir / "Contents" / "section2.xml"
-        if fallback.exists():
-            appendix_path = fallback
+    if body_name is None and "Contents/section1.xml" in tx.sections:
+        body_name = "Contents/section1.xml"
+    if appendix_name is None and "Contents/section2.xml" in tx.sections:
+        appendix_name = "Contents/section2.xml"
     # Single-section templates (e.g. MS_YOON: body + 붙임 + 참고 all in one
     # section) have no distinct appendix section — the 붙임/참고 bars live in
     # the body section. Use the body section as the appendix skeleton source.
-    if appendix_path is None and body_path is not None:
-        appendix_path = body_path
+    if appendix_name is None and body_name is not None:
+        appendix_name = body_name
 
-    return body_path, appendix_path
+    return body_name, appendix_name
 
 
 def build_style_map_from_template(template_dir, line_spacing_band=DEFAULT_LINE_SPACING_BAND):
@@ -938,17 +1202,19 @@ def build_style_map_from_template(template_dir, line_spacing_band=DEFAULT_LINE_S
 
     Returns a style map dict compatible with DEFAULT_STYLE_MAP, or None on failure.
     """
-    template_dir = Path(template_dir)
-    header_path = template_dir / "Contents" / "header.xml"
+    return _build_style_map(_TemplateXml.from_dir(template_dir), line_spacing_band)
 
+
+def _build_style_map(tx, line_spacing_band=DEFAULT_LINE_SPACING_BAND):
+    """In-memory core of :func:`build_style_map_from_template` (takes a _TemplateXml)."""
     # Detect body and appendix sections by structural analysis
-    body_section_path, appendix_section_path = _detect_template_sections(template_dir)
+    body_name, appendix_name = tx.roles()
 
-    if not header_path.exists() or not body_section_path.exists():
+    if tx.header is None or body_name is None:
         return None
 
     # Phase A: Parse header catalogs
-    char_catalog, para_catalog = _parse_header_catalogs(header_path)
+    char_catalog, para_catalog = tx.header_catalogs()
     if char_catalog is None:
         return None
 
@@ -956,8 +1222,8 @@ def build_style_map_from_template(template_dir, line_spacing_band=DEFAULT_LINE_S
 
     try:
         # Phase B: Parse body section (section0 or section1 depending on template)
-        s1_xml = body_section_path.read_text(encoding='utf-8')
-        s1_paras, _ = _extract_all_top_level_paragraphs(s1_xml)
+        s1_xml = tx.sections[body_name]
+        s1_paras, _ = tx.paragraphs(body_name)
         if not s1_paras:
             return None
 
@@ -1117,7 +1383,7 @@ def build_style_map_from_template(template_dir, line_spacing_band=DEFAULT_LINE_S
                     break
 
         # --- Bold twins for body styles (exact-twin discovery) ---
-        header_xml_text = header_path.read_text(encoding='utf-8')
+        header_xml_text = tx.header
         for style_key, bold_key in (("paragraph", "paragraph_bold"),
                                     ("bullet", "bullet_bold"),
                                     ("dash", "dash_bold"),
@@ -1226,16 +1492,15 @@ def build_style_map_from_template(template_dir, line_spacing_band=DEFAULT_LINE_S
         # Per-position table style profiles keyed by column count.
         try:
             sm['table_profiles'] = _build_table_profile_catalog(
-                s1_xml, header_path.read_text(encoding='utf-8'))
+                s1_xml, tx.header)
         except Exception as e:
             print(f"Warning: could not build table profiles: {e}")
             sm['table_profiles'] = {}
 
         # Phase E: Parse appendix section for appendix roles
-        if appendix_section_path.exists():
+        if appendix_name is not None:
             try:
-                s2_xml = appendix_section_path.read_text(encoding='utf-8')
-                s2_paras, _ = _extract_all_top_level_paragraphs(s2_xml)
+                s2_paras, _ = tx.paragraphs(appendix_name)
                 s2_attrs = [_extract_para_attrs(p) for p in s2_paras]
 
                 # Find the appendix-bar paragraph (1x3 붙임/참고 bar). Prefer the
@@ -1620,9 +1885,10 @@ def inject_appendix_labels(p0_xml, tab_label, title_text):
 # XML Building Helpers
 # ============================================================================
 
-def sec_pr_xml(outline_ref="1"):
-    """Generate the secPr element for the first paragraph."""
-    return f'''<hp:secPr id="" textDirection="HORIZONTAL" spaceColumns="1134" tabStop="8000" tabStopVal="4000" tabStopUnit="HWPUNIT" outlineShapeIDRef="{outline_ref}" memoShapeIDRef="0" textVerticalWidthHead="0" masterPageCnt="0">
+# secPr skeleton, rendered once at import. Only outlineShapeIDRef varies per
+# call, so sec_pr_xml() is a single %-substitution instead of re-formatting
+# ~2KB of page/footnote/border literals every time.
+_SEC_PR_TEMPLATE = f'''<hp:secPr id="" textDirection="HORIZONTAL" spaceColumns="1134" tabStop="8000" tabStopVal="4000" tabStopUnit="HWPUNIT" outlineShapeIDRef="%s" memoShapeIDRef="0" textVerticalWidthHead="0" masterPageCnt="0">
         <hp:grid lineGrid="0" charGrid="0" wonggojiFormat="0"/>
         <hp:startNum pageStartsOn="BOTH" page="0" pic="0" tbl="0" equation="0"/>
         <hp:visibility hideFirstHeader="0" hideFirstFooter="0" hideFirstMasterPage="0" border="SHOW_ALL" fill="SHOW_ALL" hideFirstPageNum="0" hideFirstEmptyLine="0" showLineNumber="0"/>
@@ -1656,6 +1922,43 @@ def sec_pr_xml(outline_ref="1"):
       </hp:secPr>'''
 
 
+@lru_cache(maxsize=8)
+def sec_pr_xml(outline_ref="1"):
+    """Generate the secPr element for the first paragraph."""
+    return _SEC_PR_TEMPLATE % outline_ref
+
+
+_FIRST_PARA_HEAD_TEMPLATE = (
+    '<hp:p id="%s" paraPrIDRef="%s" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
+    '<hp:run charPrIDRef="%s">'
+    '<hp:ctrl><hp:colPr id="" type="NEWSPAPER" layout="LEFT" colCount="1" sameSz="1" sameGap="0"/></hp:ctrl>'
+    '%s'
+    '</hp:run>'
+    '<hp:run charPrIDRef="0"><hp:ctrl><hp:pageNum pos="BOTTOM_CENTER" formatType="DIGIT" sideChar="-"/></hp:ctrl></hp:run>')
+
+
+@lru_cache(maxsize=16)
+def _first_para_head_xml(para_id, para_pr_id, ctrl_char_pr_id, outline_ref):
+    """Section-opening paragraph up to its bar run: colPr + secPr + page number."""
+    return _FIRST_PARA_HEAD_TEMPLATE % (para_id, para_pr_id, ctrl_char_pr_id, sec_pr_xml(outline_ref))
+
+
+@lru_cache(maxsize=64)
+def _lineseg_line_fmt(vertsize, textheight, baseline, spacing, horzpos, horzsize):
+    """%-template of one <hp:lineseg> for a paragraph style's metrics.
+
+    A document uses a few dozen metric sets, so only textpos, vertpos and
+    flags are substituted per line.
+    """
+    return (f'<hp:lineseg textpos="%s" vertpos="%s" '
+            f'vertsize="{vertsize}" textheight="{textheight}" '
+            f'baseline="{baseline}" spacing="{spacing}" '
+            f'horzpos="{horzpos}" horzsize="{horzsize}" flags="%s"/>')
+
+
+# Memoized: cells, spacers and bar rows repeat the same (vertpos, metrics,
+# text) tuples many times per document. All arguments are hashable scalars.
+@lru_cache(maxsize=256)
 def lineseg_xml(textpos=0, vertpos=0, vertsize=1000, textheight=1000,
                 baseline=850, spacing=600, horzpos=0, horzsize=HORZSIZE_DEFAULT,
                 num_lines=1, full_text="", text_len=0):
@@ -1672,18 +1975,18 @@ def lineseg_xml(textpos=0, vertpos=0, vertsize=1000, textheight=1000,
         full_text: The actual paragraph text — used to compute accurate line breaks.
         text_len: Deprecated fallback; use full_text instead.
     """
+    line_fmt = _lineseg_line_fmt(vertsize, textheight, baseline, spacing, horzpos, horzsize)
     if num_lines <= 1:
-        return (f'<hp:linesegarray>'
-                f'<hp:lineseg textpos="{textpos}" vertpos="{vertpos}" '
-                f'vertsize="{vertsize}" textheight="{textheight}" '
-                f'baseline="{baseline}" spacing="{spacing}" '
-                f'horzpos="{horzpos}" horzsize="{horzsize}" flags="{FLAGS_FIRST_LINE}"/>'
-                f'</hp:linesegarray>')
+        return ('<hp:linesegarray>'
+                + line_fmt % (textpos, vertpos, _FLAGS_FIRST_LINE_S)
+                + '</hp:linesegarray>')
 
     # Compute accurate line break positions from actual text
     if full_text:
-        breaks = estimate_line_breaks(full_text, vertsize, horzsize)
+        breaks = _line_breaks(full_text, vertsize, horzsize)
         # Pad breaks list if estimate_line_breaks returned fewer than num_lines
+        if len(breaks) < num_lines:
+            breaks = list(breaks)
         while len(breaks) < num_lines:
             last_tp = breaks[-1]
             remaining = len(full_text) - last_tp
@@ -1695,178 +1998,233 @@ def lineseg_xml(textpos=0, vertpos=0, vertsize=1000, textheight=1000,
         chars_per_line = max(1, tl // num_lines)
         breaks = [i * chars_per_line for i in range(num_lines)]
 
-    segs = ""
-    for i in range(num_lines):
-        vp = vertpos + i * (vertsize + spacing)
-        tp = breaks[i] if i < len(breaks) else breaks[-1]
-        flags = FLAGS_FIRST_LINE if i == 0 else FLAGS_CONTINUATION
-        segs += (f'<hp:lineseg textpos="{tp}" vertpos="{vp}" '
-                 f'vertsize="{vertsize}" textheight="{textheight}" '
-                 f'baseline="{baseline}" spacing="{spacing}" '
-                 f'horzpos="{horzpos}" horzsize="{horzsize}" flags="{flags}"/>')
-    return f'<hp:linesegarray>{segs}</hp:linesegarray>'
+    # breaks now holds at least num_lines starts; extra ones are dropped.
+    step = vertsize + spacing
+    segs = ['<hp:linesegarray>', line_fmt % (breaks[0], vertpos, _FLAGS_FIRST_LINE_S)]
+    segs.extend(line_fmt % (tp, vertpos + i * step, _FLAGS_CONTINUATION_S)
+                for i, tp in enumerate(islice(breaks, 1, num_lines), start=1))
+    segs.append('</hp:linesegarray>')
+    return ''.join(segs)
+
+
+@lru_cache(maxsize=64)
+def _paragraph_open_xml(para_pr_id, style_id, para_id, page_break):
+    """Opening <hp:p> tag; each item type reuses a handful of (paraPr, style) pairs."""
+    return (f'<hp:p id="{para_id}" paraPrIDRef="{para_pr_id}" styleIDRef="{style_id}" '
+            f'pageBreak="{page_break}" columnBreak="0" merged="0">')
 
 
 def paragraph_xml(para_pr_id, style_id, runs_xml, lineseg, para_id="2147483648", page_break="0"):
     """Generate a complete paragraph element."""
-    return (f'<hp:p id="{para_id}" paraPrIDRef="{para_pr_id}" styleIDRef="{style_id}" '
-            f'pageBreak="{page_break}" columnBreak="0" merged="0">'
-            f'{runs_xml}{lineseg}</hp:p>')
+    return _paragraph_open_xml(para_pr_id, style_id, para_id, page_break) + runs_xml + lineseg + '</hp:p>'
 
 
+# Memoized: a content item's position lives only in its lineseg, so repeated
+# items (spacers, end runs, identical bullets/labels) share their run markup.
+@lru_cache(maxsize=1024)
 def run_xml(char_pr_id, text="", inner_xml=""):
     """Generate a run element."""
-    content = ""
-    if inner_xml:
-        content = inner_xml
     if text:
-        content += f'<hp:t>{xml_escape(text)}</hp:t>'
-    if not content:
-        return f'<hp:run charPrIDRef="{char_pr_id}"/>'
-    return f'<hp:run charPrIDRef="{char_pr_id}">{content}</hp:run>'
+        return f'<hp:run charPrIDRef="{char_pr_id}">{inner_xml}<hp:t>{xml_escape(text)}</hp:t></hp:run>'
+    if inner_xml:
+        return f'<hp:run charPrIDRef="{char_pr_id}">{inner_xml}</hp:run>'
+    return f'<hp:run charPrIDRef="{char_pr_id}"/>'
 
 
-def table_cell_xml(col_addr, row_addr, width, height, border_fill_id,
-                   para_pr_id, char_pr_id, text, vert_align="CENTER",
-                   style_id="0", vertsize=1200, textheight=1200, baseline=1020, spacing=360):
-    """Generate a table cell element with multi-line support."""
-    inner_hz = width - 1022  # Hancom uses width-1022 (e.g. 15874→14852)
-    inner_hz = max(inner_hz, 0)
+def run_xml_safe(char_pr_id, text):
+    """Run element for trusted literal text (marker glyphs, separators).
+
+    Skips escaping; ``text`` must be non-empty and contain no ``&<>``.
+    """
+    return f'<hp:run charPrIDRef="{char_pr_id}"><hp:t>{text}</hp:t></hp:run>'
+
+
+# Span of every unmerged cell the table and bar builders emit.
+_CELL_SPAN_1X1 = '<hp:cellSpan colSpan="1" rowSpan="1"/>'
+# Horizontal padding Hancom subtracts from a cell's width for its text area
+# (e.g. 15874→14852).
+_CELL_INNER_PAD = 1022
+
+
+@lru_cache(maxsize=16)
+def _cell_margin_xml(left, right, top, bottom):
+    """<hp:cellMargin>; a table uses a handful of margin sets, so each is built once."""
+    return f'<hp:cellMargin left="{left}" right="{right}" top="{top}" bottom="{bottom}"/>'
 
-    # Estimate lines for cell text
-    nlines = estimate_line_count(text, vertsize, inner_hz) if text else 1
 
+@lru_cache(maxsize=64)
+def _cell_open_xml(border_fill_id, para_pr_id, vert_align="CENTER", style_id="0"):
+    """Opening markup of a single-paragraph <hp:tc>, up to (not incl.) the run."""
     return (f'<hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" '
             f'borderFillIDRef="{border_fill_id}">'
             f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" '
             f'vertAlign="{vert_align}" linkListIDRef="0" linkListNextIDRef="0" '
             f'textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
             f'<hp:p id="2147483648" paraPrIDRef="{para_pr_id}" styleIDRef="{style_id}" '
-            f'pageBreak="0" columnBreak="0" merged="0">'
-            f'{run_xml(char_pr_id, text)}'
-            f'{lineseg_xml(vertsize=vertsize, textheight=textheight, baseline=baseline, spacing=spacing, horzsize=inner_hz, num_lines=nlines, full_text=text)}'
-            f'</hp:p></hp:subList>'
-            f'<hp:cellAddr colAddr="{col_addr}" rowAddr="{row_addr}"/>'
-            f'<hp:cellSpan colSpan="1" rowSpan="1"/>'
-            f'<hp:cellSz width="{width}" height="{height}"/>'
-            f'<hp:cellMargin left="510" right="510" top="141" bottom="141"/>'
-            f'</hp:tc>')
+            f'pageBreak="0" columnBreak="0" merged="0">')
+
+
+def _cell_close_xml(col_addr, row_addr, width, height,
+                    left=510, right=510, top=141, bottom=141):
+    """Closing markup of a <hp:tc>, from the paragraph end to the cell margin.
+
+    Table builders pass ``"%d"`` for the per-row values to get a reusable
+    ``%``-template for a column.
+    """
+    return (f'</hp:p></hp:subList><hp:cellAddr colAddr="{col_addr}" rowAddr="{row_addr}"/>'
+            f'{_CELL_SPAN_1X1}<hp:cellSz width="{width}" height="{height}"/>'
+            f'{_cell_margin_xml(left, right, top, bottom)}</hp:tc>')
+
+
+# Memoized: a cell paragraph always starts at vertpos 0, so its markup depends
+# only on the text and style, and tables repeat values ("-", "0", units, ...).
+@lru_cache(maxsize=4096)
+def _cell_body_xml(char_pr_id, text, inner_hz, vertsize, textheight, baseline, spacing):
+    """Run + lineseg of a cell paragraph, wrapped for ``inner_hz``."""
+    nlines = estimate_line_count(text, vertsize, inner_hz) if text else 1
+    return run_xml(char_pr_id, text) + lineseg_xml(
+        vertsize=vertsize, textheight=textheight, baseline=baseline, spacing=spacing,
+        horzsize=inner_hz, num_lines=nlines, full_text=text)
+
+
+def table_cell_xml(col_addr, row_addr, width, height, border_fill_id,
+                   para_pr_id, char_pr_id, text, vert_align="CENTER",
+                   style_id="0", vertsize=1200, textheight=1200, baseline=1020, spacing=360):
+    """Generate a table cell element with multi-line support."""
+    inner_hz = width - _CELL_INNER_PAD if width > _CELL_INNER_PAD else 0
+    return (_cell_open_xml(border_fill_id, para_pr_id, vert_align, style_id)
+            + _cell_body_xml(char_pr_id, text, inner_hz, vertsize, textheight, baseline, spacing)
+            + _cell_close_xml(col_addr, row_addr, width, height))
 
 
 # ============================================================================
 # Title Bar Generator (3-row gradient bar)
 # ============================================================================
 
-def title_bar_xml(title_text, sm, table_id=1975012386):
-    """Generate the 3-row title bar (gradient top, title, gradient bottom)."""
-    bar_width = 48077
-    hz = bar_width - 281  # Hancom uses 47796 (not 47795)
+# Everything but the title text depends only on template-derived IDs, so the
+# row wrappers and the table opening are rendered once and reused for every
+# section.
+_TITLE_BAR_WIDTH = 48077
+_TITLE_BAR_HZ = _TITLE_BAR_WIDTH - 281  # Hancom uses 47796 (not 47795)
 
-    top = sm["title_bar_top"]
-    mid = sm["title_bar_title"]
-    bot = sm["title_bar_bottom"]
 
-    row1 = (f'<hp:tr><hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_gradient_top"]}">'
-            f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" '
-            f'linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-            f'<hp:p id="2147483648" paraPrIDRef="{top[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-            f'<hp:run charPrIDRef="{top[0]}"/>'
-            f'{lineseg_xml(vertsize=top[2], textheight=top[3], baseline=top[4], spacing=top[5], horzsize=hz)}'
-            f'</hp:p></hp:subList>'
-            f'<hp:cellAddr colAddr="0" rowAddr="0"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-            f'<hp:cellSz width="{bar_width}" height="380"/>'
-            f'<hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc></hp:tr>')
-
-    row2 = (f'<hp:tr><hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_title_bg"]}">'
-            f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" '
-            f'linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-            f'<hp:p id="2147483648" paraPrIDRef="{mid[1]}" styleIDRef="15" pageBreak="0" columnBreak="0" merged="0">'
-            f'{run_xml(mid[0], title_text)}'
-            f'<hp:run charPrIDRef="{sm["heading_tail"][0]}"/>'
-            f'{lineseg_xml(vertsize=mid[2], textheight=mid[3], baseline=mid[4], spacing=mid[5], horzsize=hz)}'
-            f'</hp:p></hp:subList>'
-            f'<hp:cellAddr colAddr="0" rowAddr="1"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-            f'<hp:cellSz width="{bar_width}" height="2563"/>'
-            f'<hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc></hp:tr>')
-
-    row3 = (f'<hp:tr><hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_gradient_bot"]}">'
-            f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" '
-            f'linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-            f'<hp:p id="2147483648" paraPrIDRef="{bot[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-            f'<hp:run charPrIDRef="{bot[0]}"/>'
-            f'{lineseg_xml(vertsize=bot[2], textheight=bot[3], baseline=bot[4], spacing=bot[5], horzsize=hz)}'
-            f'</hp:p></hp:subList>'
-            f'<hp:cellAddr colAddr="0" rowAddr="2"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-            f'<hp:cellSz width="{bar_width}" height="380"/>'
-            f'<hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc></hp:tr>')
+@lru_cache(maxsize=16)
+def _title_bar_row_parts(border_fill_id, para_pr_id, style_id, row_addr, height):
+    """(open, close) markup of one title-bar row around its runs + lineseg."""
+    return ('<hp:tr>' + _cell_open_xml(border_fill_id, para_pr_id, "CENTER", style_id),
+            _cell_close_xml(0, row_addr, _TITLE_BAR_WIDTH, height, 141, 141, 141, 141) + '</hp:tr>')
 
+
+@lru_cache(maxsize=8)
+def _title_bar_open_xml(table_id, border_fill_id):
+    """Opening <hp:tbl> of the title bar, up to (not incl.) the first row."""
     return (f'<hp:tbl id="{table_id}" zOrder="2" numberingType="TABLE" '
             f'textWrap="TOP_AND_BOTTOM" textFlow="BOTH_SIDES" lock="0" dropcapstyle="None" '
             f'pageBreak="NONE" repeatHeader="1" rowCnt="3" colCnt="1" cellSpacing="0" '
-            f'borderFillIDRef="{sm["bf_table"]}" noAdjust="0">'
-            f'<hp:sz width="{bar_width}" widthRelTo="ABSOLUTE" height="3323" heightRelTo="ABSOLUTE" protect="0"/>'
+            f'borderFillIDRef="{border_fill_id}" noAdjust="0">'
+            f'<hp:sz width="{_TITLE_BAR_WIDTH}" widthRelTo="ABSOLUTE" height="3323" heightRelTo="ABSOLUTE" protect="0"/>'
             f'<hp:pos treatAsChar="1" affectLSpacing="0" flowWithText="1" allowOverlap="0" '
             f'holdAnchorAndSO="0" vertRelTo="PARA" horzRelTo="PARA" vertAlign="TOP" horzAlign="LEFT" '
             f'vertOffset="0" horzOffset="0"/>'
             f'<hp:outMargin left="140" right="140" top="140" bottom="140"/>'
-            f'<hp:inMargin left="140" right="140" top="140" bottom="140"/>'
-            f'{row1}{row2}{row3}</hp:tbl>')
+            f'<hp:inMargin left="140" right="140" top="140" bottom="140"/>')
+
+
+def title_bar_xml(title_text, sm, table_id=1975012386):
+    """Generate the 3-row title bar (gradient top, title, gradient bottom)."""
+    top = sm["title_bar_top"]
+    mid = sm["title_bar_title"]
+    bot = sm["title_bar_bottom"]
+
+    rows = (
+        (sm["bf_gradient_top"], top, "0", 0, 380, f'<hp:run charPrIDRef="{top[0]}"/>'),
+        (sm["bf_title_bg"], mid, "15", 1, 2563,
+         run_xml(mid[0], title_text) + f'<hp:run charPrIDRef="{sm["heading_tail"][0]}"/>'),
+        (sm["bf_gradient_bot"], bot, "0", 2, 380, f'<hp:run charPrIDRef="{bot[0]}"/>'),
+    )
+    parts = [_title_bar_open_xml(table_id, sm["bf_table"])]
+    for border_fill_id, style, style_id, row_addr, height, runs in rows:
+        row_open, row_close = _title_bar_row_parts(border_fill_id, style[1], style_id, row_addr, height)
+        parts.append(row_open)
+        parts.append(runs)
+        parts.append(lineseg_xml(vertsize=style[2], textheight=style[3], baseline=style[4],
+                                 spacing=style[5], horzsize=_TITLE_BAR_HZ))
+        parts.append(row_close)
+    parts.append('</hp:tbl>')
+    return ''.join(parts)
 
 
 # ============================================================================
 # Appendix Bar Generator
 # ============================================================================
 
-def appendix_bar_xml(tab_label, title_text, sm, table_id=1977606721):
-    """Generate appendix-style title bar (참고N | separator | title)."""
-    total_width = 48159
-    col1_w, col2_w, col3_w = 5968, 565, 41626
+_APPENDIX_BAR_WIDTH = 48159
+_APPENDIX_BAR_HEIGHT = 2831
+
+
+@lru_cache(maxsize=16)
+def _appendix_bar_cell_parts(border_fill_id, para_pr_id, col_addr, width):
+    """(open, close) markup of one appendix-bar cell around its runs + lineseg."""
+    return (_cell_open_xml(border_fill_id, para_pr_id),
+            _cell_close_xml(col_addr, 0, width, _APPENDIX_BAR_HEIGHT, 141, 141, 141, 141))
 
-    tab_s = sm["appendix_tab"]
-    sep_s = sm["appendix_sep_cell"]
-    ttl_s = sm["appendix_title"]
-    sep_c = sm["appendix_sep_char"]
-
-    cells = (
-        f'<hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_appendix_tab"]}">'
-        f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-        f'<hp:p id="2147483648" paraPrIDRef="{tab_s[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-        f'{run_xml(tab_s[0], tab_label)}'
-        f'{lineseg_xml(vertsize=tab_s[2], textheight=tab_s[3], baseline=tab_s[4], spacing=tab_s[5], horzsize=5684)}'
-        f'</hp:p></hp:subList>'
-        f'<hp:cellAddr colAddr="0" rowAddr="0"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-        f'<hp:cellSz width="{col1_w}" height="2831"/><hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc>'
-
-        f'<hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_appendix_sep"]}">'
-        f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-        f'<hp:p id="2147483648" paraPrIDRef="{sep_s[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-        f'<hp:run charPrIDRef="{sep_s[0]}"/>'
-        f'{lineseg_xml(vertsize=sep_s[2], textheight=sep_s[3], baseline=sep_s[4], spacing=sep_s[5], horzsize=1440)}'
-        f'</hp:p></hp:subList>'
-        f'<hp:cellAddr colAddr="1" rowAddr="0"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-        f'<hp:cellSz width="{col2_w}" height="2831"/><hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc>'
-
-        f'<hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" borderFillIDRef="{sm["bf_appendix_title"]}">'
-        f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" vertAlign="CENTER" linkListIDRef="0" linkListNextIDRef="0" textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-        f'<hp:p id="2147483648" paraPrIDRef="{ttl_s[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-        f'{run_xml(sep_c[0], " ")}{run_xml(ttl_s[0], title_text)}'
-        f'{lineseg_xml(vertsize=ttl_s[2], textheight=ttl_s[3], baseline=ttl_s[4], spacing=ttl_s[5], horzsize=41344)}'
-        f'</hp:p></hp:subList>'
-        f'<hp:cellAddr colAddr="2" rowAddr="0"/><hp:cellSpan colSpan="1" rowSpan="1"/>'
-        f'<hp:cellSz width="{col3_w}" height="2831"/><hp:cellMargin left="141" right="141" top="141" bottom="141"/></hp:tc>'
-    )
 
+@lru_cache(maxsize=8)
+def _appendix_sep_cell_xml(border_fill_id, char_pr_id, para_pr_id,
+                           vertsize, textheight, baseline, spacing):
+    """Empty separator cell (column 1) of the appendix bar.
+
+    Takes the style entry's fields rather than the entry itself: a caller's
+    style map may hold lists (JSON-shaped), which cannot be cache keys.
+    """
+    cell_open, cell_close = _appendix_bar_cell_parts(border_fill_id, para_pr_id, 1, 565)
+    return (cell_open + f'<hp:run charPrIDRef="{char_pr_id}"/>'
+            + lineseg_xml(vertsize=vertsize, textheight=textheight, baseline=baseline,
+                          spacing=spacing, horzsize=1440)
+            + cell_close)
+
+
+@lru_cache(maxsize=8)
+def _appendix_bar_open_xml(table_id, border_fill_id):
+    """Opening <hp:tbl> and <hp:tr> of the appendix bar."""
     return (f'<hp:tbl id="{table_id}" zOrder="3" numberingType="TABLE" '
             f'textWrap="TOP_AND_BOTTOM" textFlow="BOTH_SIDES" lock="0" dropcapstyle="None" '
             f'pageBreak="CELL" repeatHeader="1" rowCnt="1" colCnt="3" cellSpacing="0" '
-            f'borderFillIDRef="{sm["bf_table"]}" noAdjust="0">'
-            f'<hp:sz width="{total_width}" widthRelTo="ABSOLUTE" height="2831" heightRelTo="ABSOLUTE" protect="0"/>'
+            f'borderFillIDRef="{border_fill_id}" noAdjust="0">'
+            f'<hp:sz width="{_APPENDIX_BAR_WIDTH}" widthRelTo="ABSOLUTE" height="{_APPENDIX_BAR_HEIGHT}" heightRelTo="ABSOLUTE" protect="0"/>'
             f'<hp:pos treatAsChar="1" affectLSpacing="0" flowWithText="1" allowOverlap="0" '
             f'holdAnchorAndSO="0" vertRelTo="PARA" horzRelTo="PARA" vertAlign="TOP" horzAlign="LEFT" '
             f'vertOffset="0" horzOffset="0"/>'
             f'<hp:outMargin left="0" right="0" top="0" bottom="0"/>'
             f'<hp:inMargin left="141" right="141" top="141" bottom="141"/>'
-            f'<hp:tr>{cells}</hp:tr></hp:tbl>')
+            f'<hp:tr>')
+
+
+def appendix_bar_xml(tab_label, title_text, sm, table_id=1977606721):
+    """Generate appendix-style title bar (참고N | separator | title)."""
+    col1_w, col3_w = 5968, 41626
+
+    tab_s = sm["appendix_tab"]
+    ttl_s = sm["appendix_title"]
+
+    tab_open, tab_close = _appendix_bar_cell_parts(sm["bf_appendix_tab"], tab_s[1], 0, col1_w)
+    ttl_open, ttl_close = _appendix_bar_cell_parts(sm["bf_appendix_title"], ttl_s[1], 2, col3_w)
+    return ''.join((
+        _appendix_bar_open_xml(table_id, sm["bf_table"]),
+        tab_open,
+        run_xml(tab_s[0], tab_label),
+        lineseg_xml(vertsize=tab_s[2], textheight=tab_s[3], baseline=tab_s[4],
+                    spacing=tab_s[5], horzsize=5684),
+        tab_close,
+        _appendix_sep_cell_xml(sm["bf_appendix_sep"], *sm["appendix_sep_cell"][:6]),
+        ttl_open,
+        run_xml_safe(sm["appendix_sep_char"][0], " "),
+        run_xml(ttl_s[0], title_text),
+        lineseg_xml(vertsize=ttl_s[2], textheight=ttl_s[3], baseline=ttl_s[4],
+                    spacing=ttl_s[5], horzsize=41344),
+        ttl_close,
+        '</hp:tr></hp:tbl>',
+    ))
 
 
 # ============================================================================
@@ -1877,32 +2235,18 @@ def _profile_cell_xml(col, row, width, height, text, cell, char_h, margin):
     """Emit one <hp:tc> reusing a profile cell's style, with regenerated text
     and a recomputed lineseg for the given width (Hancom does not recalc)."""
     inner_hz = max(width - (margin["left"] + margin["right"]) - 2, 0)
-    nlines = estimate_line_count(text, char_h, inner_hz) if text else 1
-    baseline = int(char_h * 0.85)
-    return (f'<hp:tc name="" header="0" hasMargin="0" protect="0" editable="0" dirty="0" '
-            f'borderFillIDRef="{cell["bf"]}">'
-            f'<hp:subList id="" textDirection="HORIZONTAL" lineWrap="BREAK" '
-            f'vertAlign="{cell["valign"]}" linkListIDRef="0" linkListNextIDRef="0" '
-            f'textWidth="0" textHeight="0" hasTextRef="0" hasNumRef="0">'
-            f'<hp:p id="2147483648" paraPrIDRef="{cell["paraPr"]}" styleIDRef="0" '
-            f'pageBreak="0" columnBreak="0" merged="0">'
-            f'{run_xml(cell["charPr"], text)}'
-            f'{lineseg_xml(vertsize=char_h, textheight=char_h, baseline=baseline, spacing=360, horzsize=inner_hz, num_lines=nlines, full_text=text)}'
-            f'</hp:p></hp:subList>'
-            f'<hp:cellAddr colAddr="{col}" rowAddr="{row}"/>'
-            f'<hp:cellSpan colSpan="1" rowSpan="1"/>'
-            f'<hp:cellSz width="{width}" height="{height}"/>'
-            f'<hp:cellMargin left="{margin["left"]}" right="{margin["right"]}" '
-            f'top="{margin["top"]}" bottom="{margin["bottom"]}"/>'
-            f'</hp:tc>')
+    return (f'{_cell_open_xml(cell["bf"], cell["paraPr"], cell["valign"])}'
+            f'{_cell_body_xml(cell["charPr"], text, inner_hz, char_h, char_h, int(char_h * 0.85), 360)}'
+            f'{_cell_close_xml(col, row, width, height, **margin)}')
 
 
 def _row_height(texts, widths, char_h, base_h, margin):
     """Row height = max over cells of (wrapped lines) accommodated, >= base_h."""
+    h_margin = margin["left"] + margin["right"] + 2
     max_lines = 1
     for t, w in zip(texts, widths):
         if t:
-            max_lines = max(max_lines, estimate_line_count(t, char_h, max(w - (margin["left"] + margin["right"]) - 2, 0)))
+            max_lines = max(max_lines, estimate_line_count(t, char_h, max(w - h_margin, 0)))
     computed = max_lines * char_h + (max_lines - 1) * 360 + margin["top"] + margin["bottom"]
     return max(base_h, computed)
 
@@ -1931,23 +2275,36 @@ def _data_table_from_profile(headers, rows, prof, sm, caption, table_id):
                           prof["header_h"], margin)
         for j in range(ncols))
     total_height = h_h
-    body_rows = ""
+    # Per-column cell fragments for body rows: only the text, its lineseg,
+    # rowAddr and row height vary, so the rest is rendered once per column.
+    body_h = prof["body_h"]
+    body_bl = int(body_h * 0.85)
+    inner_hz = [max(w - (margin["left"] + margin["right"]) - 2, 0) for w in widths]
+    col_open = {role: [_cell_open_xml(c["bf"], c["paraPr"], c["valign"]) for c in prof[role]]
+                for role in ("first", "interior", "last")}
+    col_close = [_cell_close_xml(j, "%d", widths[j], "%d", **margin) for j in range(ncols)]
+    body_rows = []
     for i, row in enumerate(rows):
         role = body_role(i)
         texts = [str(row[j]) if j < len(row) else "" for j in range(ncols)]
-        rh = _row_height(texts, widths, prof["body_h"], prof["row_h"][role], margin)
+        rh = _row_height(texts, widths, body_h, prof["row_h"][role], margin)
         total_height += rh
-        cells = "".join(
-            _profile_cell_xml(j, i + 1, widths[j], rh, texts[j], prof[role][j],
-                              prof["body_h"], margin)
+        cells = prof[role]
+        opens = col_open[role]
+        body_rows.append('<hp:tr>')
+        body_rows.extend(
+            opens[j]
+            + _cell_body_xml(cells[j]["charPr"], texts[j], inner_hz[j], body_h, body_h, body_bl, 360)
+            + col_close[j] % (i + 1, rh)
             for j in range(ncols))
-        body_rows += f'<hp:tr>{cells}</hp:tr>'
+        body_rows.append('</hp:tr>')
+    body_rows = "".join(body_rows)
 
-    paragraphs = ""
+    paragraphs = []
     if caption:
         tc = sm["table_caption"]
-        paragraphs += paragraph_xml(tc[1], "0", run_xml(tc[0], f"< {caption} >"),
-                                     lineseg_xml(vertsize=tc[2], textheight=tc[3], baseline=tc[4], spacing=tc[5]))
+        paragraphs.append(paragraph_xml(tc[1], "0", run_xml(tc[0], f"< {caption} >"),
+                                        lineseg_xml(vertsize=tc[2], textheight=tc[3], baseline=tc[4], spacing=tc[5])))
     wrapper_vertsize = total_height + 566
     tw = sm["table_wrapper"]
     tbl = (f'<hp:tbl id="{table_id}" zOrder="0" numberingType="TABLE" '
@@ -1961,11 +2318,11 @@ def _data_table_from_profile(headers, rows, prof, sm, caption, table_id):
            f'<hp:outMargin left="283" right="283" top="283" bottom="283"/>'
            f'<hp:inMargin left="{margin["left"]}" right="{margin["right"]}" top="{margin["top"]}" bottom="{margin["bottom"]}"/>'
            f'<hp:tr>{header_cells}</hp:tr>{body_rows}</hp:tbl>')
-    paragraphs += paragraph_xml(tw[1], "0",
-                                 f'<hp:run charPrIDRef="{tw[0]}">{tbl}<hp:t/></hp:run>',
-                                 lineseg_xml(vertsize=wrapper_vertsize, textheight=wrapper_vertsize,
-                                             baseline=int(wrapper_vertsize * 0.85), spacing=tw[5]))
-    return paragraphs, wrapper_vertsize
+    paragraphs.append(paragraph_xml(tw[1], "0",
+                                    f'<hp:run charPrIDRef="{tw[0]}">{tbl}<hp:t/></hp:run>',
+                                    lineseg_xml(vertsize=wrapper_vertsize, textheight=wrapper_vertsize,
+                                                baseline=int(wrapper_vertsize * 0.85), spacing=tw[5])))
+    return "".join(paragraphs), wrapper_vertsize
 
 
 def data_table_xml(headers, rows, sm, caption="", table_id=1974981391):
@@ -1984,24 +2341,31 @@ def data_table_xml(headers, rows, sm, caption="", table_id=1974981391):
     row_height = 2048
     total_height = row_height * num_rows
     th = sm["table_header"]; tb = sm["table_body"]
-    header_cells = ""
-    for i, (hdr, w) in enumerate(zip(headers, col_widths)):
-        header_cells += table_cell_xml(i, 0, w, row_height, sm["bf_table_header"],
-                                        th[1], th[0], hdr,
-                                        vertsize=th[2], textheight=th[3], baseline=th[4], spacing=th[5])
-    body_rows = ""
+    header_cells = "".join(
+        table_cell_xml(i, 0, w, row_height, sm["bf_table_header"],
+                       th[1], th[0], hdr,
+                       vertsize=th[2], textheight=th[3], baseline=th[4], spacing=th[5])
+        for i, (hdr, w) in enumerate(zip(headers, col_widths)))
+    # Body cells share everything but text, lineseg and rowAddr: render the
+    # open markup once and a rowAddr %-template per column.
+    body_open = _cell_open_xml(sm["bf_table"], tb[1])
+    col_inner = [max(w - _CELL_INNER_PAD, 0) for w in col_widths]
+    col_close = [_cell_close_xml(i, "%d", w, row_height) for i, w in enumerate(col_widths)]
+    body_rows = []
     for r_idx, row in enumerate(rows):
-        cells = ""
-        for c_idx, (cell_text, w) in enumerate(zip(row, col_widths)):
-            cells += table_cell_xml(c_idx, r_idx + 1, w, row_height, sm["bf_table"],
-                                     tb[1], tb[0], str(cell_text),
-                                     vertsize=tb[2], textheight=tb[3], baseline=tb[4], spacing=tb[5])
-        body_rows += f'<hp:tr>{cells}</hp:tr>'
-    paragraphs = ""
+        body_rows.append('<hp:tr>')
+        body_rows.extend(
+            body_open
+            + _cell_body_xml(tb[0], str(cell_text), col_inner[c_idx], tb[2], tb[3], tb[4], tb[5])
+            + col_close[c_idx] % (r_idx + 1)
+            for c_idx, cell_text in enumerate(row[:len(col_widths)]))
+        body_rows.append('</hp:tr>')
+    body_rows = "".join(body_rows)
+    paragraphs = []
     if caption:
         tc = sm["table_caption"]
-        paragraphs += paragraph_xml(tc[1], "0", run_xml(tc[0], f"< {caption} >"),
-                                     lineseg_xml(vertsize=tc[2], textheight=tc[3], baseline=tc[4], spacing=tc[5]))
+        paragraphs.append(paragraph_xml(tc[1], "0", run_xml(tc[0], f"< {caption} >"),
+                                        lineseg_xml(vertsize=tc[2], textheight=tc[3], baseline=tc[4], spacing=tc[5])))
     wrapper_vertsize = total_height + 566
     tw = sm["table_wrapper"]
     tbl = (f'<hp:tbl id="{table_id}" zOrder="0" numberingType="TABLE" '
@@ -2015,11 +2379,11 @@ def data_table_xml(headers, rows, sm, caption="", table_id=1974981391):
            f'<hp:outMargin left="283" right="283" top="283" bottom="283"/>'
            f'<hp:inMargin left="510" right="510" top="141" bottom="141"/>'
            f'<hp:tr>{header_cells}</hp:tr>{body_rows}</hp:tbl>')
-    paragraphs += paragraph_xml(tw[1], "0",
-                                 f'<hp:run charPrIDRef="{tw[0]}">{tbl}<hp:t/></hp:run>',
-                                 lineseg_xml(vertsize=wrapper_vertsize, textheight=wrapper_vertsize,
-                                             baseline=int(wrapper_vertsize * 0.85), spacing=tw[5]))
-    return paragraphs, wrapper_vertsize
+    paragraphs.append(paragraph_xml(tw[1], "0",
+                                    f'<hp:run charPrIDRef="{tw[0]}">{tbl}<hp:t/></hp:run>',
+                                    lineseg_xml(vertsize=wrapper_vertsize, textheight=wrapper_vertsize,
+                                                baseline=int(wrapper_vertsize * 0.85), spacing=tw[5])))
+    return "".join(paragraphs), wrapper_vertsize
 
 
 # Bullet-level types for transition spacer detection
@@ -2092,96 +2456,139 @@ _MARKER_ITEM_CFG = {
 def _build_segmented_runs(prefix, segments, base_cp, bold_cp, end_cp=None):
     """Build run XML: a normal prefix run, one run per segment (base or bold
     charPr), then an optional trailing end run."""
-    runs = run_xml(base_cp, prefix) if prefix else ""
-    for t, bold in segments:
-        runs += run_xml(bold_cp if bold else base_cp, t)
+    runs = [run_xml_safe(base_cp, prefix)] if prefix else []
+    runs.extend(run_xml(bold_cp if bold else base_cp, t) for t, bold in segments)
     if end_cp is not None:
-        runs += run_xml(end_cp)
-    return runs
+        runs.append(run_xml(end_cp))
+    return ''.join(runs)
 
 
 def _render_marker_item(item, sm, vpt, cfg, item_index=None):
     """Render paragraph/bullet/dash/star/note, supporting string or segment
     array text. String text uses the unchanged single-run path."""
+    prefix, style_key, bold_key, end_key = cfg
     text = item.get("text", "")
-    s = sm[cfg["style"]]
-    end_cp = sm[cfg["end"]][0] if cfg["end"] else None
-    segments = _normalize_text_segments(text, item_index)
-    full_text = f"{cfg['prefix']}{_segments_plain_text(segments)}"
+    char_pr, para_pr, vertsize, textheight, baseline, spacing = sm[style_key]
+    end_cp = sm[end_key][0] if end_key else None
     if isinstance(text, str):
-        nlines = estimate_line_count(full_text, s[2])
-        vp = vpt.next(s[2], s[5], nlines)
-        runs = run_xml(s[0], full_text) + (run_xml(end_cp) if end_cp is not None else "")
+        full_text = prefix + text
+        nlines = estimate_line_count(full_text, vertsize)
+        runs = run_xml(char_pr, full_text) + (run_xml(end_cp) if end_cp is not None else "")
     else:
-        nlines = _segmented_line_count([(cfg["prefix"], False)] + segments, s[2])
-        vp = vpt.next(s[2], s[5], nlines)
+        segments = _normalize_text_segments(text, item_index)
+        full_text = prefix + _segments_plain_text(segments)
+        nlines = _segmented_line_count([(prefix, False)] + segments, vertsize)
         # Fall back to the base charPr if no bold key is present (e.g. a cache
         # written before bold support) -> bold segments render at normal weight.
-        bold_cp = sm.get(cfg["bold"], s[0])
-        runs = _build_segmented_runs(cfg["prefix"], segments, s[0], bold_cp, end_cp)
-    return paragraph_xml(s[1], "0", runs,
-                         lineseg_xml(vertpos=vp, vertsize=s[2], textheight=s[3],
-                                     baseline=s[4], spacing=s[5],
+        bold_cp = sm.get(bold_key, char_pr)
+        runs = _build_segmented_runs(prefix, segments, char_pr, bold_cp, end_cp)
+    vp = vpt.next(vertsize, spacing, nlines)
+    return paragraph_xml(para_pr, "0", runs,
+                         lineseg_xml(vertpos=vp, vertsize=vertsize, textheight=textheight,
+                                     baseline=baseline, spacing=spacing,
                                      num_lines=nlines, full_text=full_text))
 
 
+# Heading = marker run + " text" run + trailing-space run; the measured line
+# is the concatenation of the three.
+_HEADING_MARKER = "□"
+_HEADING_TAIL = " "
+
+
+def _render_heading_item(item, sm, vpt, item_index=None):
+    text = " " + _segments_plain_text(_normalize_text_segments(item.get("text", ""), item_index))
+    char_pr, para_pr, vertsize, textheight, baseline, spacing = sm["heading_marker"]
+    full_text = _HEADING_MARKER + text + _HEADING_TAIL
+    nlines = estimate_line_count(full_text, vertsize)
+    vp = vpt.next(vertsize, spacing, nlines)
+    runs = (run_xml_safe(char_pr, _HEADING_MARKER) +
+            run_xml(sm["heading_text"][0], text) +
+            run_xml_safe(sm["heading_tail"][0], _HEADING_TAIL) +
+            run_xml(sm["heading_end"][0]))
+    return paragraph_xml(para_pr, "15", runs,
+                          lineseg_xml(vertpos=vp, vertsize=vertsize, textheight=textheight,
+                                      baseline=baseline, spacing=spacing,
+                                      num_lines=nlines, full_text=full_text))
+
+
+def _render_table_item(item, sm, vpt, item_index=None):
+    # Tables use their own internal lineseg; advance vpt with actual sizes
+    tc = sm["table_caption"]
+    if item.get("caption"):
+        cap_text = f"< {item['caption']} >"
+        cap_nlines = estimate_line_count(cap_text, tc[2])
+        vpt.next(tc[2], tc[5], cap_nlines)
+
+    tbl_xml, wrapper_vs = data_table_xml(
+        item.get("headers", []), item.get("rows", []),
+        sm, item.get("caption", ""), item.get("table_id", 1974981391))
+
+    tw = sm["table_wrapper"]
+    vpt.next(wrapper_vs, tw[5])  # table wrapper para
+    return tbl_xml
+
+
+def _render_empty_item(item, sm, vpt, item_index=None):
+    char_pr, para_pr, vertsize, textheight, baseline, spacing = sm["spacer_small"]
+    vp = vpt.next(vertsize, spacing)
+    return paragraph_xml(para_pr, "0", run_xml(char_pr),
+                          lineseg_xml(vertpos=vp, vertsize=vertsize, textheight=textheight,
+                                      baseline=baseline, spacing=spacing))
+
+
+def _marker_item_handler(cfg):
+    # Resolve the cfg dict once; each item then unpacks a plain tuple.
+    resolved = (cfg["prefix"], cfg["style"], cfg["bold"], cfg["end"])
+
+    def render(item, sm, vpt, item_index=None):
+        return _render_marker_item(item, sm, vpt, resolved, item_index)
+    return render
+
+
+# Unknown item types: paragraph styling without the paragraph indent prefix.
+# Text follows the marker-item rules (string or segment array; bold segments
+# honoured, anything else rejected).
+_render_plain_item = _marker_item_handler(dict(_MARKER_ITEM_CFG["paragraph"], prefix=""))
+
+# item type -> renderer(item, sm, vpt, item_index); unknown types render as
+# plain paragraphs.
+_ITEM_HANDLERS = {
+    "heading": _render_heading_item,
+    "table": _render_table_item,
+    "empty": _render_empty_item,
+}
+_ITEM_HANDLERS.update((t, _marker_item_handler(cfg)) for t, cfg in _MARKER_ITEM_CFG.items())
+
+
 def generate_content_item(item, sm, vpt, item_index=None):
     """Generate XML for a single content item. Updates vpt (VertPosTracker)."""
-    item_type = item.get("type", "paragraph")
-    text = item.get("text", "")
+    handler = _ITEM_HANDLERS.get(item.get("type", "paragraph"), _render_plain_item)
+    return handler(item, sm, vpt, item_index)
 
-    if item_type == "heading":
-        text = _segments_plain_text(_normalize_text_segments(text, item_index))
-        s = sm["heading_marker"]
-        full_text = f"□ {text} "
-        nlines = estimate_line_count(full_text, s[2])
-        vp = vpt.next(s[2], s[5], nlines)
-        runs = (run_xml(sm["heading_marker"][0], "□") +
-                run_xml(sm["heading_text"][0], f" {text}") +
-                run_xml(sm["heading_tail"][0], " ") +
-                run_xml(sm["heading_end"][0]))
-        return paragraph_xml(s[1], "15", runs,
-                              lineseg_xml(vertpos=vp, vertsize=s[2], textheight=s[3],
-                                          baseline=s[4], spacing=s[5],
-                                          num_lines=nlines, full_text=full_text))
-
-    elif item_type in _MARKER_ITEM_CFG:
-        return _render_marker_item(item, sm, vpt, _MARKER_ITEM_CFG[item_type], item_index)
-
-    elif item_type == "table":
-        # Tables use their own internal lineseg; advance vpt with actual sizes
-        tc = sm["table_caption"]
-        if item.get("caption"):
-            cap_text = f"< {item['caption']} >"
-            cap_nlines = estimate_line_count(cap_text, tc[2])
-            vpt.next(tc[2], tc[5], cap_nlines)
-
-        tbl_xml, wrapper_vs = data_table_xml(
-            item.get("headers", []), item.get("rows", []),
-            sm, item.get("caption", ""), item.get("table_id", 1974981391))
-
-        tw = sm["table_wrapper"]
-        vpt.next(wrapper_vs, tw[5])  # table wrapper para
-        return tbl_xml
-
-    elif item_type == "empty":
-        s = sm["spacer_small"]
-        vp = vpt.next(s[2], s[5])
-        runs = run_xml(s[0])
-        return paragraph_xml(s[1], "0", runs,
-                              lineseg_xml(vertpos=vp, vertsize=s[2], textheight=s[3],
-                                          baseline=s[4], spacing=s[5]))
 
-    else:
-        s = sm["paragraph"]
-        full_text = text
-        nlines = estimate_line_count(full_text, s[2])
-        vp = vpt.next(s[2], s[5], nlines)
-        runs = run_xml(s[0], text) + run_xml(sm["paragraph_end"][0])
-        return paragraph_xml(s[1], "0", runs,
-                              lineseg_xml(vertpos=vp, vertsize=s[2], textheight=s[3],
-                                          baseline=s[4], spacing=s[5],
-                                          num_lines=nlines, full_text=full_text))
+def _append_content_items(parts, content_items, sm, vpt, index_items=True):
+    """Render a section's content items into ``parts``.
+
+    Each heading gets a small spacer paragraph before it, unless a 6pt
+    bullet-transition spacer is already emitted there. ``index_items``
+    passes each item's position to :func:`generate_content_item` for
+    error messages.
+    """
+    ss_char, ss_para, ss_vertsize, ss_textheight, ss_baseline, ss_spacing = sm["spacer_small"]
+    spacer_run = run_xml(ss_char)
+    prev_type = None
+    for idx, item in enumerate(content_items):
+        curr_type = item.get("type", "paragraph")
+        if _needs_bullet_transition_spacer(prev_type, curr_type):
+            parts.append(_bullet_transition_spacer_xml(sm, vpt))
+        elif curr_type == "heading":
+            vp = vpt.next(ss_vertsize, ss_spacing)
+            parts.append(paragraph_xml(ss_para, "0", spacer_run,
+                                       lineseg_xml(vertpos=vp, vertsize=ss_vertsize,
+                                                   textheight=ss_textheight,
+                                                   baseline=ss_baseline, spacing=ss_spacing)))
+        parts.append(generate_content_item(item, sm, vpt, item_index=idx if index_items else None))
+        prev_type = curr_type
 
 
 # ============================================================================
@@ -2195,6 +2602,8 @@ def generate_body_section_xml(section_config, sm, template_dir=None, outline_ref
     section1, whichever has colPr) and uses it as the structural skeleton
     (title bar, date line, spacer).  Appends dynamic content.  Falls back
     to fully-generated XML if template is unavailable or injection fails.
+    ``template_dir`` may be an extracted template directory or an in-memory
+    ``_TemplateXml``.
     """
     title = section_config.get("title_bar", "보고서 제목")
     content_items = section_config.get("content", [])
@@ -2205,21 +2614,16 @@ def generate_body_section_xml(section_config, sm, template_dir=None, outline_ref
     # Detects body section by styleIDRef="15" heading count.
     # Uses structural markers (colPr, RIGHT-aligned paraPr) instead of position. (V3 fix)
     if template_dir:
-        header_path = Path(template_dir) / "Contents" / "header.xml"
-        body_section_path, _ = _detect_template_sections(template_dir)
-        if body_section_path is None:
-            body_section_path = Path(template_dir) / "Contents" / "section1.xml"
-        if body_section_path.exists():
-            try:
-                raw_xml = body_section_path.read_text(encoding="utf-8")
-            except (UnicodeDecodeError, OSError):
-                raw_xml = None
+        tx = _as_template_xml(template_dir)
+        body_name, _ = tx.roles()
+        if body_name in tx.sections:
+            raw_xml = tx.sections[body_name]
             if raw_xml:
-                all_paras, sec_header = _extract_all_top_level_paragraphs(raw_xml)
+                all_paras, sec_header = tx.paragraphs(body_name)
 
                 if len(all_paras) >= 3:
                     # Build paraPr catalog for alignment detection
-                    _, para_cat = _parse_header_catalogs(header_path) if header_path.exists() else (None, None)
+                    _, para_cat = tx.header_catalogs()
 
                     # Identify skeleton by structural markers
                     skeleton_first = None  # has <hp:colPr>
@@ -2256,44 +2660,28 @@ def generate_body_section_xml(section_config, sm, template_dir=None, outline_ref
                         if p0 is not None and p1 is not None:
                             vpt = seed_vpt_from_skeleton([p0, p1, p2])
 
-                            content_xml = ""
-                            prev_type = None
-                            for idx, item in enumerate(content_items):
-                                curr_type = item.get("type", "paragraph")
-                                has_transition = _needs_bullet_transition_spacer(prev_type, curr_type)
-                                if has_transition:
-                                    content_xml += _bullet_transition_spacer_xml(sm, vpt)
-                                if curr_type == "heading" and not has_transition:
-                                    ss = sm["spacer_small"]
-                                    vp = vpt.next(ss[2], ss[5])
-                                    content_xml += paragraph_xml(ss[1], "0", run_xml(ss[0]),
-                                        lineseg_xml(vertpos=vp, vertsize=ss[2], textheight=ss[3],
-                                                    baseline=ss[4], spacing=ss[5]))
-                                content_xml += generate_content_item(item, sm, vpt, item_index=idx)
-                                prev_type = curr_type
-
-                            return sec_header + p0 + p1 + p2 + content_xml + '</hs:sec>'
+                            parts = [sec_header, p0, p1, p2]
+                            _append_content_items(parts, content_items, sm, vpt)
+                            parts.append('</hs:sec>')
+
+                            return "".join(parts)
 
     # --- Fallback: fully generated (original v3 behavior) ---
     vpt = VertPosTracker()
-    paragraphs = ""
+    paragraphs = []
 
     fp = sm["first_para"]
     vpt.next(fp[2], fp[5])
 
     title_bar = title_bar_xml(title, sm)
+    tail_cp = sm["heading_tail"][0]
     first_para = (
-        f'<hp:p id="0" paraPrIDRef="{fp[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-        f'<hp:run charPrIDRef="{sm["heading_tail"][0]}">'
-        f'<hp:ctrl><hp:colPr id="" type="NEWSPAPER" layout="LEFT" colCount="1" sameSz="1" sameGap="0"/></hp:ctrl>'
-        f'{sec_pr_xml(outline_ref)}'
-        f'</hp:run>'
-        f'<hp:run charPrIDRef="0"><hp:ctrl><hp:pageNum pos="BOTTOM_CENTER" formatType="DIGIT" sideChar="-"/></hp:ctrl></hp:run>'
-        f'<hp:run charPrIDRef="{sm["heading_tail"][0]}">{title_bar}</hp:run>'
+        _first_para_head_xml("0", fp[1], tail_cp, outline_ref) +
+        f'<hp:run charPrIDRef="{tail_cp}">{title_bar}</hp:run>'
         f'<hp:run charPrIDRef="{fp[0]}"><hp:t/></hp:run>'
         f'{lineseg_xml(vertpos=0, vertsize=fp[2], textheight=fp[3], baseline=fp[4], spacing=fp[5])}'
         f'</hp:p>')
-    paragraphs += first_para
+    paragraphs.append(first_para)
 
     if date_text and department:
         dl = sm["date_line"]
@@ -2303,33 +2691,20 @@ def generate_body_section_xml(section_config, sm, template_dir=None, outline_ref
         runs = (run_xml(dl[0], f"('{date_text}, ") +
                 run_xml(sm["date_emphasis"][0], department) +
                 run_xml(dl[0], ")"))
-        paragraphs += paragraph_xml(dl[1], "0", runs,
-                                     lineseg_xml(vertpos=vp, vertsize=dl[2], textheight=dl[3],
-                                                 baseline=dl[4], spacing=dl[5],
-                                                 num_lines=nlines, full_text=date_full_text))
+        paragraphs.append(paragraph_xml(dl[1], "0", runs,
+                                        lineseg_xml(vertpos=vp, vertsize=dl[2], textheight=dl[3],
+                                                    baseline=dl[4], spacing=dl[5],
+                                                    num_lines=nlines, full_text=date_full_text)))
 
     sp = sm["spacer_medium"]
     vp = vpt.next(sp[2], sp[5])
-    paragraphs += paragraph_xml(sp[1], "0", run_xml(sp[0]),
-                                 lineseg_xml(vertpos=vp, vertsize=sp[2], textheight=sp[3],
-                                             baseline=sp[4], spacing=sp[5]))
+    paragraphs.append(paragraph_xml(sp[1], "0", run_xml(sp[0]),
+                                    lineseg_xml(vertpos=vp, vertsize=sp[2], textheight=sp[3],
+                                                baseline=sp[4], spacing=sp[5])))
 
-    prev_type = None
-    for idx, item in enumerate(content_items):
-        curr_type = item.get("type", "paragraph")
-        has_transition = _needs_bullet_transition_spacer(prev_type, curr_type)
-        if has_transition:
-            paragraphs += _bullet_transition_spacer_xml(sm, vpt)
-        if curr_type == "heading" and not has_transition:
-            ss = sm["spacer_small"]
-            vp = vpt.next(ss[2], ss[5])
-            paragraphs += paragraph_xml(ss[1], "0", run_xml(ss[0]),
-                                         lineseg_xml(vertpos=vp, vertsize=ss[2], textheight=ss[3],
-                                                     baseline=ss[4], spacing=ss[5]))
-        paragraphs += generate_content_item(item, sm, vpt, item_index=idx)
-        prev_type = curr_type
+    _append_content_items(paragraphs, content_items, sm, vpt)
 
-    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><hs:sec {NS_DECL}>{paragraphs}</hs:sec>'
+    return _SEC_OPEN + "".join(paragraphs) + _SEC_CLOSE
 
 
 def generate_appendix_section_xml(section_config, sm, template_dir=None, outline_ref="2"):
@@ -2337,7 +2712,8 @@ def generate_appendix_section_xml(section_config, sm, template_dir=None, outline
 
     When template_dir is provided, finds the appendix section (section1 or
     section2) and uses it as the structural skeleton.  Falls back to
-    fully-generated XML if unavailable.
+    fully-generated XML if unavailable.  ``template_dir`` may be an extracted
+    template directory or an in-memory ``_TemplateXml``.
     """
     tab_label = section_config.get("title_bar", "참고1")
     appendix_title = section_config.get("appendix_title", "")
@@ -2354,16 +2730,12 @@ def generate_appendix_section_xml(section_config, sm, template_dir=None, outline
     # Detects appendix section by colPr + 1x3 table (appendix bar).
     # Uses structural markers (colPr) instead of position. (V3 fix)
     if template_dir:
-        _, appendix_section_path = _detect_template_sections(template_dir)
-        if appendix_section_path is None:
-            appendix_section_path = Path(template_dir) / "Contents" / "section2.xml"
-        if appendix_section_path.exists():
-            try:
-                raw_xml = appendix_section_path.read_text(encoding="utf-8")
-            except (UnicodeDecodeError, OSError):
-                raw_xml = None
+        tx = _as_template_xml(template_dir)
+        _, appendix_name = tx.roles()
+        if appendix_name in tx.sections:
+            raw_xml = tx.sections[appendix_name]
             if raw_xml:
-                all_paras, sec_header = _extract_all_top_level_paragraphs(raw_xml)
+                all_paras, sec_header = tx.paragraphs(appendix_name)
 
                 if len(all_paras) >= 1:
                     # Identify skeleton by structural markers
@@ -2400,70 +2772,39 @@ def generate_appendix_section_xml(section_config, sm, template_dir=None, outline
                                     lineseg_xml(vertpos=vp, vertsize=asp[2], textheight=asp[3],
                                                 baseline=asp[4], spacing=asp[5]))
 
-                            content_xml = ""
-                            prev_type = None
-                            for item in content_items:
-                                curr_type = item.get("type", "paragraph")
-                                has_transition = _needs_bullet_transition_spacer(prev_type, curr_type)
-                                if has_transition:
-                                    content_xml += _bullet_transition_spacer_xml(sm, vpt)
-                                if curr_type == "heading" and not has_transition:
-                                    ss = sm["spacer_small"]
-                                    vp = vpt.next(ss[2], ss[5])
-                                    content_xml += paragraph_xml(ss[1], "0", run_xml(ss[0]),
-                                        lineseg_xml(vertpos=vp, vertsize=ss[2], textheight=ss[3],
-                                                    baseline=ss[4], spacing=ss[5]))
-                                content_xml += generate_content_item(item, sm, vpt)
-                                prev_type = curr_type
-
-                            result = sec_header + p0
+                            parts = [sec_header, p0]
                             if skeleton_spacer is not None:
-                                result += skeleton_spacer
-                            result += spacer_xml + content_xml + '</hs:sec>'
-                            return result
+                                parts.append(skeleton_spacer)
+                            parts.append(spacer_xml)
+                            _append_content_items(parts, content_items, sm, vpt, index_items=False)
+                            parts.append('</hs:sec>')
+
+                            return "".join(parts)
 
     # --- Fallback: fully generated (original v3 behavior) ---
     vpt = VertPosTracker()
-    paragraphs = ""
+    paragraphs = []
 
     af = sm["appendix_first"]
     vpt.next(af[2], af[5])
 
     app_bar = appendix_bar_xml(tab_label, appendix_title, sm)
     first_para = (
-        f'<hp:p id="2147483648" paraPrIDRef="{af[1]}" styleIDRef="0" pageBreak="0" columnBreak="0" merged="0">'
-        f'<hp:run charPrIDRef="{af[0]}">'
-        f'<hp:ctrl><hp:colPr id="" type="NEWSPAPER" layout="LEFT" colCount="1" sameSz="1" sameGap="0"/></hp:ctrl>'
-        f'{sec_pr_xml(outline_ref)}'
-        f'</hp:run>'
-        f'<hp:run charPrIDRef="0"><hp:ctrl><hp:pageNum pos="BOTTOM_CENTER" formatType="DIGIT" sideChar="-"/></hp:ctrl></hp:run>'
+        _first_para_head_xml("2147483648", af[1], af[0], outline_ref) +
         f'<hp:run charPrIDRef="{af[0]}">{app_bar}<hp:t/></hp:run>'
         f'{lineseg_xml(vertpos=0, vertsize=af[2], textheight=af[3], baseline=af[4], spacing=af[5])}'
         f'</hp:p>')
-    paragraphs += first_para
+    paragraphs.append(first_para)
 
     asp = sm["appendix_spacer"]
     vp = vpt.next(asp[2], asp[5])
-    paragraphs += paragraph_xml(asp[1], "15", run_xml(asp[0]),
-                                 lineseg_xml(vertpos=vp, vertsize=asp[2], textheight=asp[3],
-                                             baseline=asp[4], spacing=asp[5]))
+    paragraphs.append(paragraph_xml(asp[1], "15", run_xml(asp[0]),
+                                    lineseg_xml(vertpos=vp, vertsize=asp[2], textheight=asp[3],
+                                                baseline=asp[4], spacing=asp[5])))
 
-    prev_type = None
-    for item in content_items:
-        curr_type = item.get("type", "paragraph")
-        has_transition = _needs_bullet_transition_spacer(prev_type, curr_type)
-        if has_transition:
-            paragraphs += _bullet_transition_spacer_xml(sm, vpt)
-        if curr_type == "heading" and not has_transition:
-            ss = sm["spacer_small"]
-            vp = vpt.next(ss[2], ss[5])
-            paragraphs += paragraph_xml(ss[1], "0", run_xml(ss[0]),
-                                         lineseg_xml(vertpos=vp, vertsize=ss[2], textheight=ss[3],
-                                                     baseline=ss[4], spacing=ss[5]))
-        paragraphs += generate_content_item(item, sm, vpt)
-        prev_type = curr_type
+    _append_content_items(paragraphs, content_items, sm, vpt, index_items=False)
 
-    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><hs:sec {NS_DECL}>{paragraphs}</hs:sec>'
+    return _SEC_OPEN + "".join(paragraphs) + _SEC_CLOSE
 
 
 # ============================================================================
@@ -2475,20 +2816,46 @@ def generate_cover_section_xml(template_section0_path, config, sm):
     Generate cover page by modifying the template's section0.xml.
     Injects title, date, and department into the correct cells.
     """
-    content = Path(template_section0_path).read_text(encoding="utf-8")
+    return _cover_section_from_xml(
+        Path(template_section0_path).read_text(encoding="utf-8"), config, sm)
+
+
+_COVER_TITLE_CELL = 'borderFillIDRef="8"'
+_COVER_TITLE_RUN = '<hp:run charPrIDRef="25"/>'
+_COVER_TITLE_RUN_RE = re.compile(r'<hp:run\s+charPrIDRef="25"\s*/>')
+
+
+_DATE_DIGITS_RE = re.compile(r'\d+')
 
+
+def _cover_section_from_xml(content, config, sm):
+    """In-memory core of :func:`generate_cover_section_xml`."""
     title = config.get("title", "")
     date_str = config.get("date", "")
 
     # --- Inject title ---
+    # Fill the first empty charPr 25 run after the title cell's borderFill.
+    # Two linear find() scans; the title is spliced in literally (a regex
+    # replacement would interpret backslashes in it).
     if title:
-        pattern = r'(borderFillIDRef="8".*?<hp:run charPrIDRef="25")/>'
-        replacement = rf'\1><hp:t>{xml_escape(title)}</hp:t></hp:run>'
-        content = re.sub(pattern, replacement, content, count=1, flags=re.DOTALL)
+        start = content.find(_COVER_TITLE_CELL)
+        if start >= 0:
+            start += len(_COVER_TITLE_CELL)
+            at = content.find(_COVER_TITLE_RUN, start)
+            end = at + len(_COVER_TITLE_RUN)
+            if at < 0:
+                # Re-saved templates may space the empty run differently.
+                m = _COVER_TITLE_RUN_RE.search(content, start)
+                if m:
+                    at, end = m.span()
+            if at >= 0:
+                content = (content[:at]
+                           + f'<hp:run charPrIDRef="25"><hp:t>{xml_escape(title)}</hp:t></hp:run>'
+                           + content[end:])
 
     # --- Inject date ---
     if date_str:
-        parts = re.findall(r'\d+', date_str)
+        parts = _DATE_DIGITS_RE.findall(date_str)
         if len(parts) >= 3:
             year = parts[0] if len(parts[0]) == 4 else f"20{parts[0]}"
             month = parts[1]
@@ -2512,34 +2879,11 @@ def generate_cover_section_xml(template_section0_path, config, sm):
 # content.hpf / container.rdf Generators
 # ============================================================================
 
-def generate_content_hpf(num_sections, has_images=True, image_files=None,
-                         title="보고서", creator="이노베이션아카데미"):
-    """Generate the content.hpf (OPF package manifest).
-
-    Args:
-        image_files: Optional list of image filenames in BinData/ (e.g. ['image1.png']).
-            If None, falls back to has_images flag with image1.png only.
-    """
-    now = datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-    manifest = '<opf:item id="header" href="Contents/header.xml" media-type="application/xml"/>'
-    if image_files:
-        for img in sorted(image_files):
-            img_id = img.rsplit('.', 1)[0]  # e.g. 'image1'
-            ext = img.rsplit('.', 1)[-1].lower()
-            media_type = {'png': 'image/png', 'jpg': 'image/jpg', 'jpeg': 'image/jpeg',
-                          'gif': 'image/gif', 'bmp': 'image/bmp'}.get(ext, 'image/png')
-            manifest += f'<opf:item id="{img_id}" href="BinData/{img}" media-type="{media_type}" isEmbeded="1"/>'
-    elif has_images:
-        manifest += '<opf:item id="image1" href="BinData/image1.png" media-type="image/png" isEmbeded="1"/>'
-    for i in range(num_sections):
-        manifest += f'<opf:item id="section{i}" href="Contents/section{i}.xml" media-type="application/xml"/>'
-    manifest += '<opf:item id="settings" href="settings.xml" media-type="application/xml"/>'
-
-    spine = '<opf:itemref idref="header" linear="yes"/>'
-    for i in range(num_sections):
-        spine += f'<opf:itemref idref="section{i}" linear="yes"/>'
-
-    ns_block = ' '.join(f'xmlns:{p}="{u}"' for p, u in [
+# OPF package skeleton, rendered once at import; per-document values are
+# filled with a single %-substitution in generate_content_hpf().
+_CONTENT_HPF_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><opf:package '
+    + ' '.join(f'xmlns:{p}="{u}"' for p, u in [
         ('ha', 'http://www.hancom.co.kr/hwpml/2011/app'),
         ('hp', 'http://www.hancom.co.kr/hwpml/2011/paragraph'),
         ('hp10', 'http://www.hancom.co.kr/hwpml/2016/paragraph'),
@@ -2556,33 +2900,96 @@ def generate_content_hpf(num_sections, has_images=True, image_files=None,
         ('epub', 'http://www.idpf.org/2007/ops'),
         ('config', 'urn:oasis:names:tc:opendocument:xmlns:config:1.0'),
     ])
+    + ' version="" unique-identifier="" id="">'
+    '<opf:metadata><opf:title>%(title)s</opf:title><opf:language>ko</opf:language>'
+    '<opf:meta name="creator" content="text">%(creator)s</opf:meta>'
+    '<opf:meta name="subject" content="text"/><opf:meta name="description" content="text"/>'
+    '<opf:meta name="lastsaveby" content="text">Claude</opf:meta>'
+    '<opf:meta name="CreatedDate" content="text">%(now)s</opf:meta>'
+    '<opf:meta name="ModifiedDate" content="text">%(now)s</opf:meta>'
+    '<opf:meta name="keyword" content="text"/></opf:metadata>'
+    '<opf:manifest>%(manifest)s</opf:manifest><opf:spine>%(spine)s</opf:spine></opf:package>'
+)
+
+
+_HPF_SECTION_ITEM = ('<opf:item id="section%(i)d" href="Contents/section%(i)d.xml" '
+                     'media-type="application/xml"/>')
+_HPF_SECTION_ITEMREF = '<opf:itemref idref="section%(i)d" linear="yes"/>'
+_IMAGE_MEDIA_TYPES = {'png': 'image/png', 'jpg': 'image/jpg', 'jpeg': 'image/jpeg',
+                      'gif': 'image/gif', 'bmp': 'image/bmp'}
+
+
+def generate_content_hpf(num_sections, has_images=True, image_files=None,
+                         title="보고서", creator="이노베이션아카데미", timestamp=None):
+    """Generate the content.hpf (OPF package manifest).
+
+    Args:
+        image_files: Optional list of image filenames in BinData/ (e.g. ['image1.png']).
+            If None, falls back to has_images flag with image1.png only.
+        timestamp: ``datetime`` used for CreatedDate/ModifiedDate, so a caller
+            can stamp a whole package consistently. Naive values are taken as
+            local time; either kind is written in UTC. Defaults to now.
+    """
+    ts = timestamp if timestamp is not None else datetime.now(timezone.utc)
+    now = ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    manifest, spine = _hpf_manifest_spine(
+        num_sections, has_images, tuple(image_files) if image_files else None)
+    return _CONTENT_HPF_TEMPLATE % {
+        "title": xml_escape(title), "creator": xml_escape(creator),
+        "now": now, "manifest": manifest, "spine": spine,
+    }
 
-    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><opf:package {ns_block} version="" unique-identifier="" id="">'
-            f'<opf:metadata><opf:title>{xml_escape(title)}</opf:title><opf:language>ko</opf:language>'
-            f'<opf:meta name="creator" content="text">{xml_escape(creator)}</opf:meta>'
-            f'<opf:meta name="subject" content="text"/><opf:meta name="description" content="text"/>'
-            f'<opf:meta name="lastsaveby" content="text">Claude</opf:meta>'
-            f'<opf:meta name="CreatedDate" content="text">{now}</opf:meta>'
-            f'<opf:meta name="ModifiedDate" content="text">{now}</opf:meta>'
-            f'<opf:meta name="keyword" content="text"/></opf:metadata>'
-            f'<opf:manifest>{manifest}</opf:manifest><opf:spine>{spine}</opf:spine></opf:package>')
 
+@lru_cache(maxsize=16)
+def _hpf_manifest_spine(num_sections, has_images, image_files):
+    """(manifest, spine) markup of content.hpf; ``image_files`` is a tuple or None.
 
+    These depend only on the package layout, so batch runs from one template
+    render them once; the per-document title/creator/timestamp are filled in
+    by generate_content_hpf.
+    """
+    manifest = ['<opf:item id="header" href="Contents/header.xml" media-type="application/xml"/>']
+    if image_files:
+        for img in sorted(image_files):
+            img_id = img.rsplit('.', 1)[0]  # e.g. 'image1'
+            ext = img.rsplit('.', 1)[-1].lower()
+            media_type = _IMAGE_MEDIA_TYPES.get(ext, 'image/png')
+            manifest.append(f'<opf:item id="{img_id}" href="BinData/{img}" media-type="{media_type}" isEmbeded="1"/>')
+    elif has_images:
+        manifest.append('<opf:item id="image1" href="BinData/image1.png" media-type="image/png" isEmbeded="1"/>')
+    manifest.extend(_HPF_SECTION_ITEM % {"i": i} for i in range(num_sections))
+    manifest.append('<opf:item id="settings" href="settings.xml" media-type="application/xml"/>')
+
+    spine = '<opf:itemref idref="header" linear="yes"/>' + ''.join(
+        _HPF_SECTION_ITEMREF % {"i": i} for i in range(num_sections))
+    return ''.join(manifest), spine
+
+
+_RDF_PKG_NS = 'http://www.hancom.co.kr/hwpml/2016/meta/pkg#'
+_CONTAINER_RDF_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>'
+    '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+    f'<rdf:Description rdf:about=""><ns0:hasPart xmlns:ns0="{_RDF_PKG_NS}" '
+    'rdf:resource="Contents/header.xml"/></rdf:Description>'
+    '<rdf:Description rdf:about="Contents/header.xml">'
+    f'<rdf:type rdf:resource="{_RDF_PKG_NS}HeaderFile"/></rdf:Description>')
+_CONTAINER_RDF_SECTION = (
+    f'<rdf:Description rdf:about=""><ns0:hasPart xmlns:ns0="{_RDF_PKG_NS}" '
+    'rdf:resource="Contents/section%(i)d.xml"/></rdf:Description>'
+    '<rdf:Description rdf:about="Contents/section%(i)d.xml">'
+    f'<rdf:type rdf:resource="{_RDF_PKG_NS}SectionFile"/></rdf:Description>')
+_CONTAINER_RDF_TAIL = (
+    '<rdf:Description rdf:about="">'
+    f'<rdf:type rdf:resource="{_RDF_PKG_NS}Document"/></rdf:Description></rdf:RDF>')
+
+
+@lru_cache(maxsize=16)
 def generate_container_rdf(num_sections):
     """Generate container.rdf."""
-    d = ('<rdf:Description rdf:about=""><ns0:hasPart xmlns:ns0="http://www.hancom.co.kr/hwpml/2016/meta/pkg#" '
-         'rdf:resource="Contents/header.xml"/></rdf:Description>'
-         '<rdf:Description rdf:about="Contents/header.xml">'
-         '<rdf:type rdf:resource="http://www.hancom.co.kr/hwpml/2016/meta/pkg#HeaderFile"/></rdf:Description>')
-    for i in range(num_sections):
-        d += (f'<rdf:Description rdf:about=""><ns0:hasPart xmlns:ns0="http://www.hancom.co.kr/hwpml/2016/meta/pkg#" '
-              f'rdf:resource="Contents/section{i}.xml"/></rdf:Description>'
-              f'<rdf:Description rdf:about="Contents/section{i}.xml">'
-              f'<rdf:type rdf:resource="http://www.hancom.co.kr/hwpml/2016/meta/pkg#SectionFile"/></rdf:Description>')
-    d += ('<rdf:Description rdf:about="">'
-          '<rdf:type rdf:resource="http://www.hancom.co.kr/hwpml/2016/meta/pkg#Document"/></rdf:Description>')
-    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>'
-            f'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">{d}</rdf:RDF>')
+    d = [_CONTAINER_RDF_HEAD]
+    d.extend(_CONTAINER_RDF_SECTION % {"i": i} for i in range(num_sections))
+    d.append(_CONTAINER_RDF_TAIL)
+    return ''.join(d)
 
 
 # ============================================================================
@@ -2614,29 +3021,64 @@ def trim_unused_styles(contents_dir):
     if not section_files:
         return
 
+    hdr_content = header_path.read_text(encoding="utf-8")
+    sections = [sf.read_text(encoding="utf-8") for sf in section_files]
+    new_hdr, new_sections = _trim_unused_styles_xml(hdr_content, sections)
+    if new_hdr != hdr_content:
+        header_path.write_text(new_hdr, encoding="utf-8")
+    for sf, original, content in zip(section_files, sections, new_sections):
+        if content != original:
+            sf.write_text(content, encoding="utf-8")
+
+
+# Patterns of the style-trimming pass, which runs on every generated package.
+_IDREF_RES = {attr: re.compile(rf'{attr}="(\d+)"')
+              for attr in ("charPrIDRef", "paraPrIDRef", "borderFillIDRef")}
+_STYLE_CHAR_REF_RE = re.compile(r'<hh:style[^>]*charPrIDRef="(\d+)"')
+_STYLE_PARA_REF_RE = re.compile(r'<hh:style[^>]*paraPrIDRef="(\d+)"')
+_CHAR_PR_ID_RE = re.compile(r'<hh:charPr\s+id="(\d+)"')
+_PARA_PR_ID_RE = re.compile(r'<hh:paraPr\s+id="(\d+)"')
+# Full entry, either self-closing (no nested children) or paired with its
+# explicit closing tag (so nested self-closing children don't end the match).
+_HH_ENTRY_RES = {tag: re.compile(rf'(<hh:{tag}\s+id=")(\d+)("(?:[^<]*/>|.*?</hh:{tag}>))', re.DOTALL)
+                 for tag in ("charPr", "paraPr")}
+_CHAR_PR_COUNT_RE = re.compile(r'(charPrCount=")(\d+)(")')
+_PARA_PR_COUNT_RE = re.compile(r'(paraPrCount=")(\d+)(")')
+_CHAR_PROPERTIES_CNT_RE = re.compile(r'(<hh:charProperties\b[^>]*?\bitemCnt=")(\d+)(")')
+_PARA_PROPERTIES_CNT_RE = re.compile(r'(<hh:paraProperties\b[^>]*?\bitemCnt=")(\d+)(")')
+
+
+def _trim_unused_styles_xml(hdr_content, sections):
+    """In-memory core of :func:`trim_unused_styles`.
+
+    Takes the header.xml text and a list of section XML strings and returns
+    ``(header, sections)`` with unused charPr/paraPr entries removed and all
+    IDRefs remapped. Inputs are returned unchanged when nothing is unused.
+    """
     # Step 1: Scan all sections for used IDs
     used_char_ids = set()
     used_para_ids = set()
     used_bf_ids = set()
 
-    for sf in section_files:
-        content = sf.read_text(encoding="utf-8")
-        used_char_ids.update(re.findall(r'charPrIDRef="(\d+)"', content))
-        used_para_ids.update(re.findall(r'paraPrIDRef="(\d+)"', content))
-        used_bf_ids.update(re.findall(r'borderFillIDRef="(\d+)"', content))
+    char_ref_re = _IDREF_RES["charPrIDRef"]
+    para_ref_re = _IDREF_RES["paraPrIDRef"]
+    bf_ref_re = _IDREF_RES["borderFillIDRef"]
+    for content in sections:
+        used_char_ids.update(char_ref_re.findall(content))
+        used_para_ids.update(para_ref_re.findall(content))
+        used_bf_ids.update(bf_ref_re.findall(content))
 
     # Also scan header.xml for IDs referenced by styles and other internal elements
-    hdr_content = header_path.read_text(encoding="utf-8")
     # Styles reference charPr/paraPr IDs that must be kept even if not in sections
-    style_char_refs = set(re.findall(r'<hh:style[^>]*charPrIDRef="(\d+)"', hdr_content))
-    style_para_refs = set(re.findall(r'<hh:style[^>]*paraPrIDRef="(\d+)"', hdr_content))
+    style_char_refs = set(_STYLE_CHAR_REF_RE.findall(hdr_content))
+    style_para_refs = set(_STYLE_PARA_REF_RE.findall(hdr_content))
     used_char_ids.update(style_char_refs)
     used_para_ids.update(style_para_refs)
 
     # Step 2: Parse header.xml to find defined IDs
     # charPr entries: <hh:charPr id="N" ...>
-    char_pr_entries = list(re.finditer(r'<hh:charPr\s+id="(\d+)"', hdr_content))
-    para_pr_entries = list(re.finditer(r'<hh:paraPr\s+id="(\d+)"', hdr_content))
+    char_pr_entries = list(_CHAR_PR_ID_RE.finditer(hdr_content))
+    para_pr_entries = list(_PARA_PR_ID_RE.finditer(hdr_content))
 
     defined_char_ids = {m.group(1) for m in char_pr_entries}
     defined_para_ids = {m.group(1) for m in para_pr_entries}
@@ -2649,7 +3091,7 @@ def trim_unused_styles(contents_dir):
     remove_char = defined_char_ids - keep_char_ids
     remove_para = defined_para_ids - keep_para_ids
     if not remove_char and not remove_para:
-        return
+        return hdr_content, sections
 
     # Step 4: Remove unused entries from header.xml and build remapping
     # Process charPr entries - find full elements and remove unused ones
@@ -2661,19 +3103,10 @@ def trim_unused_styles(contents_dir):
         if not remove_ids:
             return content, {}
 
-        # Find all entries of this tag
-        # Must match EITHER:
-        #   - Self-closing: <hh:tag id="N" ... /> (no nested children)
-        #   - Paired: <hh:tag id="N" ...>...</hh:tag> (with nested children)
-        # Use explicit closing tag match to avoid stopping at nested self-closing children
-        pattern = re.compile(
-            rf'(<hh:{tag}\s+id=")(\d+)("(?:[^<]*/>|.*?</hh:{tag}>))',
-            re.DOTALL
-        )
-
         # First pass: collect entries in order, mark for removal
+        matches = list(_HH_ENTRY_RES[tag].finditer(content))
         entries = []
-        for m in pattern.finditer(content):
+        for m in matches:
             old_id = m.group(2)
             entries.append((m.start(), m.end(), old_id, old_id in remove_ids))
 
@@ -2685,31 +3118,37 @@ def trim_unused_styles(contents_dir):
                 id_map[old_id] = str(new_id)
                 new_id += 1
 
-        # Second pass: rebuild content (process in reverse to preserve positions)
-        for start, end, old_id, should_remove in reversed(entries):
+        # Second pass: rebuild content front to back as a list of pieces.
+        # (Splicing the ~1MB header once per entry made this quadratic.)
+        pieces = []
+        pos = 0
+        for m, (start, end, old_id, should_remove) in zip(matches, entries):
+            gap = content[pos:start]
             if should_remove:
-                # Remove the entry (and any preceding whitespace/newline)
-                rm_start = start
-                while rm_start > 0 and content[rm_start - 1] in ' \t\n\r':
-                    rm_start -= 1
-                content = content[:rm_start] + content[end:]
+                # Drop the entry and any whitespace/newline preceding it
+                pieces.append(gap.rstrip(' \t\n\r'))
             else:
                 # Update the id attribute with new sequential value
-                new_val = id_map[old_id]
-                segment = content[start:end]
-                segment = re.sub(rf'(id="){old_id}(")', rf'\g<1>{new_val}\2', segment, count=1)
-                content = content[:start] + segment + content[end:]
+                pieces.append(gap)
+                pieces.append(m.group(1))
+                pieces.append(id_map[old_id])
+                pieces.append(m.group(3))
+            pos = end
+        pieces.append(content[pos:])
 
-        return content, id_map
+        return ''.join(pieces), id_map
 
     hdr_content, char_id_map = remove_and_remap_entries(hdr_content, "charPr", remove_char)
     hdr_content, para_id_map = remove_and_remap_entries(hdr_content, "paraPr", remove_para)
 
-    # Update charPrCount and paraPrCount in header
+    # Update the entry counts in header: itemCnt on <hh:charProperties> and
+    # <hh:paraProperties> (what Hancom writes), plus charPrCount/paraPrCount
     remaining_char = len(defined_char_ids) - len(remove_char)
     remaining_para = len(defined_para_ids) - len(remove_para)
-    hdr_content = re.sub(r'(charPrCount=")(\d+)(")', rf'\g<1>{remaining_char}\3', hdr_content)
-    hdr_content = re.sub(r'(paraPrCount=")(\d+)(")', rf'\g<1>{remaining_para}\3', hdr_content)
+    hdr_content = _CHAR_PR_COUNT_RE.sub(rf'\g<1>{remaining_char}\3', hdr_content)
+    hdr_content = _PARA_PR_COUNT_RE.sub(rf'\g<1>{remaining_para}\3', hdr_content)
+    hdr_content = _CHAR_PROPERTIES_CNT_RE.sub(rf'\g<1>{remaining_char}\3', hdr_content, count=1)
+    hdr_content = _PARA_PROPERTIES_CNT_RE.sub(rf'\g<1>{remaining_para}\3', hdr_content, count=1)
 
     # Step 5: Apply ID remapping everywhere (single-pass to avoid double-remap)
     def remap_attr(content, attr_name, id_map):
@@ -2720,30 +3159,117 @@ def trim_unused_styles(contents_dir):
         def replacer(m):
             old = m.group(1)
             return f'{attr_name}="{active_map.get(old, old)}"'
-        return re.sub(rf'{attr_name}="(\d+)"', replacer, content)
+        return _IDREF_RES[attr_name].sub(replacer, content)
 
     # Remap charPrIDRef and paraPrIDRef references WITHIN header.xml itself
     # (e.g., <hh:style> elements reference charPr/paraPr by IDRef)
     hdr_content = remap_attr(hdr_content, "charPrIDRef", char_id_map)
     hdr_content = remap_attr(hdr_content, "paraPrIDRef", para_id_map)
 
-    # Write updated header
-    header_path.write_text(hdr_content, encoding="utf-8")
-
     # Remap IDs in all section XMLs
-    for sf in section_files:
-        content = sf.read_text(encoding="utf-8")
-        original = content
-        content = remap_attr(content, "charPrIDRef", char_id_map)
-        content = remap_attr(content, "paraPrIDRef", para_id_map)
-        if content != original:
-            sf.write_text(content, encoding="utf-8")
+    sections = [remap_attr(remap_attr(content, "charPrIDRef", char_id_map),
+                           "paraPrIDRef", para_id_map)
+                for content in sections]
+    return hdr_content, sections
 
 
 # ============================================================================
 # Main HWPX Package Builder
 # ============================================================================
 
+# Deflate level for package entries. The members are highly repetitive XML,
+# so level 1 stays within a few percent of the level-6 size for a fraction
+# of the CPU time.
+ZIP_COMPRESS_LEVEL = 1
+
+# Already-compressed media gains nothing from deflate; store it as-is.
+# (BMP is raw pixel data and still compresses well, so it stays deflated.)
+_PRECOMPRESSED_EXTS = {".png", ".jpg", ".jpeg", ".gif"}
+
+
+def _render_section(sec_config, sm, template):
+    """Render one content section (body or appendix)."""
+    if sec_config.get("type", "body") == "appendix":
+        return generate_appendix_section_xml(sec_config, sm, template_dir=template)
+    return generate_body_section_xml(sec_config, sm, template_dir=template)
+
+
+class _TemplatePackage:
+    """A template .hwpx loaded into memory by :func:`_load_template`.
+
+    ``infos``: the template's ZipInfo list in archive order (no directories);
+    ``members``: ``{member name: bytes}``; ``xml``: its _TemplateXml;
+    ``sha256``: hex digest of the file (the style-map cache key);
+    ``image_files``: sorted file names directly under BinData/, or None when
+    the template has no BinData/ members.
+    """
+
+    __slots__ = ("infos", "members", "xml", "sha256", "image_files")
+
+    def __init__(self, infos, members, xml, sha256):
+        self.infos = infos
+        self.members = members
+        self.xml = xml
+        self.sha256 = sha256
+        bin_data = [name for name in members if name.startswith("BinData/")]
+        self.image_files = (sorted(name[len("BinData/"):] for name in bin_data
+                                   if name.count("/") == 1)
+                            if bin_data else None)
+
+
+def _load_template(template_path):
+    """Load a template package, reusing the parsed copy while the file is unchanged.
+
+    Batch runs render many documents from the same template; the ZIP is then
+    decoded, hashed and analysed once instead of once per document.
+    """
+    try:
+        st = os.stat(template_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template not found: {template_path}") from None
+    return _load_template_cached(os.path.abspath(template_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_template_cached(path, mtime_ns, size):
+    # mtime/size are only part of the key, so an edited template is re-read.
+    data = Path(path).read_bytes()
+    with zipfile.ZipFile(io.BytesIO(data), 'r') as zf:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+        members = {info.filename: zf.read(info) for info in infos}
+    return _TemplatePackage(infos, members, _TemplateXml.from_members(members),
+                            hashlib.sha256(data).hexdigest())
+
+
+# Template members copied into the output unchanged (besides everything under
+# BinData/ and Preview/). Anything else in the template is not carried over.
+_PASSTHROUGH_MEMBERS = {"version.xml", "settings.xml",
+                        "META-INF/container.xml", "META-INF/manifest.xml"}
+_PASSTHROUGH_PREFIXES = ("BinData/", "Preview/")
+
+
+def _is_passthrough(name):
+    return name in _PASSTHROUGH_MEMBERS or name.startswith(_PASSTHROUGH_PREFIXES)
+
+# secCnt of the header (Hancom writes it once, on the <hh:head> root).
+_SECCNT_RE = re.compile(r'secCnt="\d+"')
+
+
+def _write_member(zf, name, data, date_time, compress_type=None):
+    """Write one package member.
+
+    ``compress_type`` defaults to storing already-compressed media as-is and
+    deflating everything else; template members pass their original method.
+    """
+    info = zipfile.ZipInfo(name, date_time=date_time)
+    if compress_type is None:
+        compress_type = (zipfile.ZIP_STORED if Path(name).suffix.lower() in _PRECOMPRESSED_EXTS
+                         else zipfile.ZIP_DEFLATED)
+    info.compress_type = compress_type
+    info.external_attr = 0o644 << 16
+    zf.writestr(info, data, compresslevel=ZIP_COMPRESS_LEVEL)
+
+
 def generate_hwpx(config, output_path, template_path=None,
                   line_spacing_band=None):
     """Generate an HWPX file from a configuration dictionary.
@@ -2760,159 +3286,134 @@ def generate_hwpx(config, output_path, template_path=None,
     template_path = Path(template_path)
     output_path = Path(output_path)
 
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template not found: {template_path}")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-
-        with zipfile.ZipFile(template_path, 'r') as zf:
-            zf.extractall(tmpdir / "template")
-
-        # Determine style map: hash-based cache with structural discovery.
-        # When a non-default line spacing is requested, skip the cache and
-        # rebuild from the template for that band (cache stores 165% only).
-        sm = None
-        if line_spacing_band is None:
-            template_hash = compute_template_hash(template_path)
-            cache_path = SKILL_DIR / "assets" / "default_styles.json"
-            sm = load_cached_style_map(cache_path, template_hash)
-            if sm is None:
-                sm = build_style_map_from_template(tmpdir / "template")
-                if sm:
-                    save_style_map_cache(cache_path, template_hash, sm)
-        else:
-            sm = build_style_map_from_template(
-                tmpdir / "template", line_spacing_band=line_spacing_band)
+    # One timestamp for the whole package (content.hpf dates, ZIP entries).
+    build_time = datetime.now()
+    build_date_time = build_time.timetuple()[:6]
+
+    # The template is held in memory (and reused across calls); passthrough
+    # members are copied from it and only the rebuilt members are generated.
+    template = _load_template(template_path)
+    members = template.members
+    tx = template.xml
+
+    # Determine style map: hash-based cache with structural discovery.
+    # When a non-default line spacing is requested, skip the cache and
+    # rebuild from the template for that band (cache stores 165% only).
+    sm = None
+    if line_spacing_band is None:
+        template_hash = template.sha256
+        cache_path = SKILL_DIR / "assets" / "default_styles.json"
+        sm = load_cached_style_map(cache_path, template_hash)
         if sm is None:
-            sm = dict(DEFAULT_STYLE_MAP)
-
-        # Prepare output structure
-        out_dir = tmpdir / "output"
-        out_dir.mkdir()
-
-        shutil.copy2(tmpdir / "template" / "mimetype", out_dir / "mimetype")
-        for f in ("version.xml", "settings.xml"):
-            src = tmpdir / "template" / f
-            if src.exists():
-                shutil.copy2(src, out_dir / f)
-
-        meta_dst = out_dir / "META-INF"
-        meta_dst.mkdir(parents=True, exist_ok=True)
-        meta_src = tmpdir / "template" / "META-INF"
-        for f in ("container.xml", "manifest.xml"):
-            src = meta_src / f
-            if src.exists():
-                shutil.copy2(src, meta_dst / f)
-
-        if (tmpdir / "template" / "BinData").exists():
-            shutil.copytree(tmpdir / "template" / "BinData", out_dir / "BinData")
-        if (tmpdir / "template" / "Preview").exists():
-            shutil.copytree(tmpdir / "template" / "Preview", out_dir / "Preview")
-
-        contents_dir = out_dir / "Contents"
-        contents_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(tmpdir / "template" / "Contents" / "header.xml", contents_dir / "header.xml")
-
-        # Build sections
-        include_cover = config.get("include_cover", True)
-        user_sections = config.get("sections", [])
-        section_files = []
-
-        # Cover page
-        if include_cover:
-            cover_src = tmpdir / "template" / "Contents" / "section0.xml"
-            if cover_src.exists():
-                # Check if section0 is a cover-only section (no body headings).
-                # Body sections have □ headings; cover sections don't. Count by
-                # marker (with legacy styleIDRef="15" fallback) so templates that
-                # don't use style 15 for headings (e.g. MS_YOON) aren't mistaken
-                # for cover pages and corrupted.
-                cover_check = cover_src.read_text(encoding="utf-8")
-                heading_count = _count_body_headings(cover_check)
-                if heading_count == 0:
-                    heading_count = len(re.findall(r'styleIDRef="15"', cover_check))
-                if heading_count == 0:
-                    cover_xml = generate_cover_section_xml(cover_src, config, sm)
-                    (contents_dir / "section0.xml").write_text(cover_xml, encoding="utf-8")
-                else:
-                    include_cover = False  # section0 is body, not cover
-            else:
-                include_cover = False
-
-            if include_cover:
-                section_files.append("section0.xml")
-
-        # Content sections
-        template_dir = tmpdir / "template"
-        section_idx = 1 if include_cover else 0
-        for sec_config in user_sections:
-            sec_type = sec_config.get("type", "body")
-            if sec_type == "body":
-                sec_config.setdefault("date", config.get("date", ""))
-                sec_config.setdefault("department", config.get("department", ""))
-                xml_content = generate_body_section_xml(sec_config, sm, template_dir=template_dir)
-            elif sec_type == "appendix":
-                xml_content = generate_appendix_section_xml(sec_config, sm, template_dir=template_dir)
+            sm = tx.style_map()
+            if sm:
+                save_style_map_cache(cache_path, template_hash, sm)
+    else:
+        sm = tx.style_map(line_spacing_band)
+    if sm is None:
+        sm = dict(DEFAULT_STYLE_MAP)
+
+    # Build sections
+    include_cover = config.get("include_cover", True)
+    user_sections = config.get("sections", [])
+    section_files = []
+    section_xmls = []
+
+    # Cover page
+    if include_cover:
+        cover_check = tx.sections.get("Contents/section0.xml")
+        if cover_check is not None:
+            # Check if section0 is a cover-only section (no body headings).
+            # Body sections have □ headings; cover sections don't. Count by
+            # marker (with legacy styleIDRef="15" fallback) so templates that
+            # don't use style 15 for headings (e.g. MS_YOON) aren't mistaken
+            # for cover pages and corrupted.
+            if tx.heading_count("Contents/section0.xml") == 0:
+                cover_xml = _cover_section_from_xml(cover_check, config, sm)
             else:
-                xml_content = generate_body_section_xml(sec_config, sm, template_dir=template_dir)
-
-            section_file = f"section{section_idx}.xml"
-            (contents_dir / section_file).write_text(xml_content, encoding="utf-8")
-            section_files.append(section_file)
-            section_idx += 1
+                include_cover = False  # section0 is body, not cover
+        else:
+            include_cover = False
 
-        if not section_files:
-            xml_content = generate_body_section_xml({"title_bar": "보고서", "content": []}, sm, template_dir=template_dir)
-            (contents_dir / "section0.xml").write_text(xml_content, encoding="utf-8")
+        if include_cover:
             section_files.append("section0.xml")
+            section_xmls.append(cover_xml)
+
+    # Content sections
+    default_date = config.get("date", "")
+    default_department = config.get("department", "")
+    for sec_config in user_sections:
+        if sec_config.get("type", "body") == "body":
+            sec_config.setdefault("date", default_date)
+            sec_config.setdefault("department", default_department)
+    rendered = [_render_section(sec_config, sm, tx) for sec_config in user_sections]
+    first_idx = 1 if include_cover else 0
+    for section_idx, xml_content in enumerate(rendered, start=first_idx):
+        section_files.append(f"section{section_idx}.xml")
+        section_xmls.append(xml_content)
 
-        total_sections = len(section_files)
-        bin_dir = out_dir / "BinData"
-        has_images = bin_dir.exists()
-        image_files = None
-        if has_images:
-            image_files = [f.name for f in sorted(bin_dir.iterdir()) if f.is_file()]
-
-        # Generate metadata files
-        title = config.get("title", "보고서")
-        creator = config.get("creator", "이노베이션아카데미")
-        (contents_dir / "content.hpf").write_text(
-            generate_content_hpf(total_sections, has_images, image_files, title, creator), encoding="utf-8")
-        (meta_dst / "container.rdf").write_text(
-            generate_container_rdf(total_sections), encoding="utf-8")
-
-        # Preview text
-        preview_dir = out_dir / "Preview"
-        preview_dir.mkdir(exist_ok=True)
-        preview_text = title
-        for sec in user_sections:
-            preview_text += f"\n{sec.get('title_bar', '')}"
-            for item in sec.get("content", []):
-                if item.get("text"):
-                    preview_text += f"\n{item['text']}"
-        (preview_dir / "PrvText.txt").write_text(preview_text, encoding="utf-8")
-
-        # Update header.xml secCnt
-        header_path = contents_dir / "header.xml"
-        hdr = header_path.read_text(encoding="utf-8")
-        hdr = re.sub(r'secCnt="\d+"', f'secCnt="{total_sections}"', hdr)
-        header_path.write_text(hdr, encoding="utf-8")
-
-        # Trim unused styles from header.xml and remap IDs in sections
-        trim_unused_styles(contents_dir)
-
-        # Build HWPX ZIP
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_path, 'w') as zf:
-            zf.write(out_dir / "mimetype", "mimetype", compress_type=zipfile.ZIP_STORED)
-            for root, dirs, files in os.walk(out_dir):
-                for file in sorted(files):
-                    if file == "mimetype":
-                        continue
-                    fp = Path(root) / file
-                    zf.write(fp, str(fp.relative_to(out_dir)), compress_type=zipfile.ZIP_DEFLATED)
-
+    if not section_files:
+        xml_content = generate_body_section_xml({"title_bar": "보고서", "content": []}, sm, template_dir=tx)
+        section_files.append("section0.xml")
+        section_xmls.append(xml_content)
+
+    total_sections = len(section_files)
+    image_files = template.image_files
+    has_images = image_files is not None
+
+    # Generate metadata files
+    title = config.get("title", "보고서")
+    creator = config.get("creator", "이노베이션아카데미")
+
+    # Preview text
+    # Non-string values (e.g. a list of text runs) are rendered with str().
+    preview_lines = [str(title)]
+    for sec in user_sections:
+        preview_lines.append(str(sec.get('title_bar', '')))
+        preview_lines.extend(str(item['text']) for item in sec.get("content", []) if item.get("text"))
+    preview_text = "\n".join(preview_lines)
+
+    # Update header.xml secCnt
+    hdr = tx.header_with_sec_cnt(total_sections)
+
+    # Trim unused styles from header.xml and remap IDs in sections
+    hdr, section_xmls = _trim_unused_styles_xml(hdr, section_xmls)
+
+    generated = {
+        "Contents/header.xml": hdr,
+        "Contents/content.hpf": generate_content_hpf(total_sections, has_images, image_files,
+                                                     title, creator, timestamp=build_time),
+        "META-INF/container.rdf": generate_container_rdf(total_sections),
+        "Preview/PrvText.txt": preview_text,
+    }
+    for section_file, xml_content in zip(section_files, section_xmls):
+        generated[f"Contents/{section_file}"] = xml_content
+
+    # Build HWPX ZIP: mimetype first (stored), then the template's members in
+    # template order -- rebuilt ones replaced in place, passthrough ones
+    # copied -- then any rebuilt members the template did not have.
+    # The archive is assembled in memory (a package is a few MB at most) and
+    # written with a single call.
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED,
+                         compresslevel=ZIP_COMPRESS_LEVEL) as zf:
+        mimetype = zipfile.ZipInfo("mimetype", date_time=build_date_time)
+        mimetype.external_attr = 0o644 << 16
+        zf.writestr(mimetype, members["mimetype"], compress_type=zipfile.ZIP_STORED)
+        for info in template.infos:
+            name = info.filename
+            if name in generated:
+                _write_member(zf, name, generated.pop(name).encode("utf-8"), build_date_time)
+            elif _is_passthrough(name):
+                compress_type = (info.compress_type
+                                 if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+                                 else None)
+                _write_member(zf, name, members[name], info.date_time, compress_type)
+        for name, text in generated.items():
+            _write_member(zf, name, text.encode("utf-8"), build_date_time)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(buf.getbuffer())
     return output_path
 
 
@@ -2921,6 +3422,7 @@ def generate_hwpx(config, output_path, template_path=None,
 # ============================================================================
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description="Generate HWPX documents (v3)")
     parser.add_argument("--output", "-o", required=True, help="Output .hwpx file path")
     parser.add_argument("--config", "-c", required=True, help="Config JSON file path")
@@ -243,5 +243,18 @@ class TestMarkerBasedBodyDetection(unittest.TestCase):
                          "should count 2 □ headings regardless of styleIDRef")
 
 
+class TestAppendixBarStyleMapShapes(unittest.TestCase):
+    """appendix_bar_xml must accept a JSON-shaped style map (list entries),
+    not only the tuple-valued maps built in-process."""
+
+    def test_list_entries_render_like_tuples(self):
+        tuple_sm = dict(G.DEFAULT_STYLE_MAP)
+        list_sm = {k: list(v) if isinstance(v, tuple) else v for k, v in tuple_sm.items()}
+        self.assertIsInstance(list_sm["appendix_sep_cell"], list)
+        expected = G.appendix_bar_xml("참고1", "붙임 제목", tuple_sm)
+        self.assertEqual(G.appendix_bar_xml("참고1", "붙임 제목", list_sm), expected)
+        self.assertEqual(set(_appendix_bar_cells(expected)), {0, 1, 2})
+
+
 if __name__ == "__main__":
     unittest.main()
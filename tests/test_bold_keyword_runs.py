@@ -166,6 +166,19 @@ class TestContentItemBold(unittest.TestCase):
                 {"type": "bullet", "text": [{"bold": True}]},
                 self._sm(), G.VertPosTracker(), item_index=2)
 
+    def test_unknown_type_renders_array_like_paragraph_without_prefix(self):
+        sm = self._sm()
+        xml = G.generate_content_item(
+            {"type": "memo", "text": [{"t": "올해 "}, {"t": "목표", "bold": True}]},
+            sm, G.VertPosTracker())
+        self.assertIn('charPrIDRef="71"><hp:t>목표</hp:t>', xml)
+        self.assertEqual(G._extract_paragraph_first_text(xml), "올해 목표")
+
+    def test_unknown_type_null_text_raises(self):
+        with self.assertRaisesRegex(ValueError, "content item 4"):
+            G.generate_content_item({"type": "memo", "text": None},
+                                    self._sm(), G.VertPosTracker(), item_index=4)
+
 
 class TestPrepScript(unittest.TestCase):
     def _twin_count(self, header):
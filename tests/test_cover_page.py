@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for cover-page injection (_cover_section_from_xml):
+  - Title spliced in literally (no regex replacement escapes), escaped
+  - Whitespace-tolerant fallback for a reformatted title run
+  - Date injection
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import generate_hwpx as G
+
+
+def _cover_xml(title_run='<hp:run charPrIDRef="25"/>'):
+    """Minimal cover section: an empty charPr 25 run before the title cell
+    (must stay untouched), the title cell with its empty run, and the date."""
+    return (
+        '<hs:sec>'
+        '<hp:p id="0"><hp:run charPrIDRef="25"/></hp:p>'
+        '<hp:tc borderFillIDRef="8"><hp:subList><hp:p id="1">'
+        f'{title_run}'
+        '</hp:p></hp:subList></hp:tc>'
+        '<hp:p id="2"><hp:run charPrIDRef="30"><hp:t>2026. </hp:t></hp:run>'
+        '<hp:run charPrIDRef="30"><hp:t>0. 0. </hp:t></hp:run></hp:p>'
+        '</hs:sec>'
+    )
+
+
+# ============================================================================
+# Cover title and date
+# ============================================================================
+
+class TestCoverTitle(unittest.TestCase):
+    """Title goes into the first empty charPr 25 run of the title cell."""
+
+    def test_backslashes_in_title_are_literal(self):
+        title = r"제목 \1 그리고 \\ 경로 & <표>"
+        out = G._cover_section_from_xml(_cover_xml(), {"title": title}, {})
+        self.assertIn('<hp:run charPrIDRef="25"><hp:t>제목 \\1 그리고 \\\\ 경로 '
+                      '&amp; &lt;표&gt;</hp:t></hp:run>', out)
+        # Only the run inside the title cell is filled.
+        self.assertTrue(out.startswith('<hs:sec><hp:p id="0"><hp:run charPrIDRef="25"/></hp:p>'))
+        self.assertEqual(out.count("<hp:t>제목"), 1)
+
+    def test_reformatted_title_run_uses_fallback(self):
+        xml = _cover_xml(title_run='<hp:run  charPrIDRef="25"  />')
+        out = G._cover_section_from_xml(xml, {"title": r"보고서 \g<0>"}, {})
+        self.assertIn('<hp:run charPrIDRef="25"><hp:t>보고서 \\g&lt;0&gt;</hp:t></hp:run>', out)
+        self.assertNotIn('<hp:run  charPrIDRef="25"  />', out)
+
+    def test_no_title_leaves_section_unchanged(self):
+        xml = _cover_xml()
+        self.assertEqual(G._cover_section_from_xml(xml, {}, {}), xml)
+
+    def test_date_injected(self):
+        out = G._cover_section_from_xml(_cover_xml(), {"date": "2026. 5. 29."}, {})
+        self.assertIn("<hp:t>2026. </hp:t>", out)
+        self.assertIn("<hp:t>5. 29. </hp:t>", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
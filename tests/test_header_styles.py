@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Tests for header.xml handling:
+  - charPr/paraPr catalogs from the streaming parser (_parse_header_catalogs)
+  - Unused-style trim (_trim_unused_styles_xml): kept entries, renumbering,
+    itemCnt and IDRef remapping
+  - Forward-pass trim output equals the original splice-per-entry algorithm
+  - secCnt substitution (_TemplateXml.header_with_sec_cnt)
+"""
+
+import copy
+import json
+import os
+import re
+import sys
+import unittest
+import zipfile
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import generate_hwpx as G
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(SKILL_DIR, "assets", "template.hwpx")
+SAMPLE_CONFIG = os.path.join(SKILL_DIR, "examples", "sample_report.json")
+
+NS = {"hh": "http://www.hancom.co.kr/hwpml/2011/head"}
+
+
+def _template_header():
+    with zipfile.ZipFile(TEMPLATE) as zf:
+        return zf.read("Contents/header.xml").decode("utf-8")
+
+
+def ref_catalogs(header_xml):
+    """ElementTree reference: direct-child fontRef/bold/align, last
+    lineSpacing descendant (the <hp:default> branch of a switch)."""
+    root = ET.fromstring(header_xml)
+    fonts = {(ff.get("lang", ""), f.get("id", "")): f.get("face", "")
+             for ff in root.iterfind(".//hh:fontface", NS)
+             for f in ff.iterfind("hh:font", NS)}
+    chars = {}
+    for cp in root.iterfind(".//hh:charPr", NS):
+        ref = cp.find("hh:fontRef", NS)
+        hangul_ref = ref.get("hangul", "0") if ref is not None else "0"
+        chars[cp.get("id", "")] = {
+            "height": int(cp.get("height", "0")),
+            "face": fonts.get(("HANGUL", hangul_ref), ""),
+            "bold": cp.find("hh:bold", NS) is not None,
+        }
+    paras = {}
+    for pp in root.iterfind(".//hh:paraPr", NS):
+        align = pp.find("hh:align", NS)
+        spacings = pp.findall(".//hh:lineSpacing", NS)
+        ls = spacings[-1] if spacings else None
+        paras[pp.get("id", "")] = {
+            "align": align.get("horizontal", "JUSTIFY") if align is not None else "JUSTIFY",
+            "line_spacing_type": ls.get("type", "PERCENT") if ls is not None else "PERCENT",
+            "line_spacing_value": ls.get("value", "160") if ls is not None else "160",
+        }
+    return chars, paras
+
+
+_HEAD = ('<hh:head xmlns:hh="http://www.hancom.co.kr/hwpml/2011/head" '
+         'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">')
+
+
+def _entries(header, tag):
+    """{id: entry markup without its id} for charPr/paraPr."""
+    return {m.group(2): m.group(1) + m.group(3)
+            for m in re.finditer(rf'(<hh:{tag}\s+id=")(\d+)("(?:[^<]*/>|.*?</hh:{tag}>))',
+                                 header, re.DOTALL)}
+
+
+# ============================================================================
+# Header catalogs
+# ============================================================================
+
+class TestHeaderCatalogs(unittest.TestCase):
+    """The XMLParser-target catalogs must equal an ElementTree walk of the
+    same header."""
+
+    def test_bundled_template_matches_reference(self):
+        header = _template_header()
+        chars, paras = G._parse_header_catalogs(None, header_xml=header)
+        ref_chars, ref_paras = ref_catalogs(header)
+        self.assertEqual(len(chars), 549)
+        self.assertEqual(len(paras), 312)
+        self.assertEqual(chars, ref_chars)
+        self.assertEqual(paras, ref_paras)
+        self.assertTrue(any(c["bold"] for c in chars.values()))
+        self.assertTrue(all(c["face"] for c in chars.values()))
+
+    def test_line_spacing_inside_switch_uses_default_branch(self):
+        header = (_HEAD + '<hh:refList><hh:paraProperties itemCnt="3">'
+                  '<hh:paraPr id="0"><hh:align horizontal="LEFT"/><hp:switch>'
+                  '<hp:case><hh:lineSpacing type="PERCENT" value="200"/></hp:case>'
+                  '<hp:default><hh:lineSpacing type="FIXED" value="155"/></hp:default>'
+                  '</hp:switch></hh:paraPr>'
+                  '<hh:paraPr id="1"><hh:lineSpacing type="PERCENT" value="130"/></hh:paraPr>'
+                  '<hh:paraPr id="2"><hh:border><hh:align horizontal="RIGHT"/></hh:border></hh:paraPr>'
+                  '</hh:paraProperties></hh:refList></hh:head>')
+        _chars, paras = G._parse_header_catalogs(None, header_xml=header)
+        self.assertEqual(paras["0"], {"align": "LEFT", "line_spacing_type": "FIXED",
+                                      "line_spacing_value": "155"})
+        self.assertEqual(paras["1"], {"align": "JUSTIFY", "line_spacing_type": "PERCENT",
+                                      "line_spacing_value": "130"})
+        # Only a direct-child align counts; defaults otherwise.
+        self.assertEqual(paras["2"], {"align": "JUSTIFY", "line_spacing_type": "PERCENT",
+                                      "line_spacing_value": "160"})
+        self.assertEqual(paras, ref_catalogs(header)[1])
+
+    def test_malformed_header_returns_none(self):
+        self.assertEqual(G._parse_header_catalogs(None, header_xml="<hh:head"), (None, None))
+
+
+# ============================================================================
+# Unused-style trim
+# ============================================================================
+
+class TestTrimUnusedStyles(unittest.TestCase):
+    """The trimmed header keeps id 0 plus every section or <hh:style>
+    reference, renumbers entries in order and remaps every IDRef."""
+
+    def setUp(self):
+        self.header = _template_header()
+        self.section = ('<hs:sec>'
+                        '<hp:p paraPrIDRef="87"><hp:run charPrIDRef="38"><hp:t>a</hp:t></hp:run>'
+                        '<hp:run charPrIDRef="71"/></hp:p>'
+                        '<hp:p paraPrIDRef="260"><hp:run charPrIDRef="5"/></hp:p>'
+                        '<hp:tc borderFillIDRef="8"/></hs:sec>')
+
+    def test_trim_keeps_used_entries_and_renumbers(self):
+        old_chars = _entries(self.header, "charPr")
+        old_paras = _entries(self.header, "paraPr")
+        hdr, (sec,) = G._trim_unused_styles_xml(self.header, [self.section])
+        new_chars = _entries(hdr, "charPr")
+        new_paras = _entries(hdr, "paraPr")
+
+        # Kept: id 0, section references and <hh:style> references.
+        style_chars = set(re.findall(r'<hh:style[^>]*charPrIDRef="(\d+)"', self.header))
+        style_paras = set(re.findall(r'<hh:style[^>]*paraPrIDRef="(\d+)"', self.header))
+        self.assertEqual(len(new_chars), len({"0", "38", "71", "5"} | style_chars))
+        self.assertEqual(len(new_paras), len({"0", "87", "260"} | style_paras))
+        self.assertLess(len(new_chars), len(old_chars))
+        self.assertLess(len(new_paras), len(old_paras))
+
+        # Sequential ids, in original order.
+        self.assertEqual(list(new_chars), [str(i) for i in range(len(new_chars))])
+        self.assertEqual(list(new_paras), [str(i) for i in range(len(new_paras))])
+
+        # Section references point at the same entry markup as before.
+        for old_id, new_id in zip(("38", "71", "5"),
+                                  re.findall(r'charPrIDRef="(\d+)"', sec)):
+            self.assertEqual(new_chars[new_id], old_chars[old_id])
+        for old_id, new_id in zip(("87", "260"), re.findall(r'paraPrIDRef="(\d+)"', sec)):
+            self.assertEqual(new_paras[new_id], old_paras[old_id])
+        self.assertIn('borderFillIDRef="8"', sec)
+
+        # <hh:style> references are remapped and still resolve.
+        for ref in re.findall(r'<hh:style[^>]*charPrIDRef="(\d+)"', hdr):
+            self.assertIn(ref, new_chars)
+        for ref in re.findall(r'<hh:style[^>]*paraPrIDRef="(\d+)"', hdr):
+            self.assertIn(ref, new_paras)
+
+        ET.fromstring(hdr)  # still well-formed
+
+    def test_item_counts_follow_trimmed_entries(self):
+        """itemCnt on <hh:charProperties>/<hh:paraProperties> must match the
+        number of entries left after trimming."""
+        hdr, _sections = G._trim_unused_styles_xml(self.header, [self.section])
+        self.assertEqual(re.search(r'<hh:charProperties itemCnt="(\d+)"', hdr).group(1),
+                         str(len(_entries(hdr, "charPr"))))
+        self.assertEqual(re.search(r'<hh:paraProperties itemCnt="(\d+)"', hdr).group(1),
+                         str(len(_entries(hdr, "paraPr"))))
+
+    def test_nothing_unused_returns_inputs(self):
+        hdr, sections = G._trim_unused_styles_xml(self.header, [self.section])
+        again_hdr, again = G._trim_unused_styles_xml(hdr, sections)
+        self.assertIs(again_hdr, hdr)
+        self.assertIs(again, sections)
+
+
+# ============================================================================
+# Forward-pass trim vs. the original algorithm
+# ============================================================================
+
+def ref_trim(hdr, sections):
+    """The original trim: entries spliced out of the header one at a time,
+    back to front, with a regex per kept id (plus the itemCnt update)."""
+    used_char, used_para = set(), set()
+    for content in sections:
+        used_char.update(re.findall(r'charPrIDRef="(\d+)"', content))
+        used_para.update(re.findall(r'paraPrIDRef="(\d+)"', content))
+    used_char.update(re.findall(r'<hh:style[^>]*charPrIDRef="(\d+)"', hdr))
+    used_para.update(re.findall(r'<hh:style[^>]*paraPrIDRef="(\d+)"', hdr))
+    defined_char = set(re.findall(r'<hh:charPr\s+id="(\d+)"', hdr))
+    defined_para = set(re.findall(r'<hh:paraPr\s+id="(\d+)"', hdr))
+    remove_char = defined_char - ((used_char & defined_char) | {"0"})
+    remove_para = defined_para - ((used_para & defined_para) | {"0"})
+
+    def remove_and_remap(content, tag, remove_ids):
+        pattern = re.compile(rf'(<hh:{tag}\s+id=")(\d+)("(?:[^<]*/>|.*?</hh:{tag}>))', re.DOTALL)
+        entries = [(m.start(), m.end(), m.group(2)) for m in pattern.finditer(content)]
+        id_map = {}
+        for _start, _end, old_id in entries:
+            if old_id not in remove_ids:
+                id_map[old_id] = str(len(id_map))
+        for start, end, old_id in reversed(entries):
+            if old_id in remove_ids:
+                rm_start = start
+                while rm_start > 0 and content[rm_start - 1] in " \t\n\r":
+                    rm_start -= 1
+                content = content[:rm_start] + content[end:]
+            else:
+                segment = re.sub(rf'(id="){old_id}(")', rf'\g<1>{id_map[old_id]}\2',
+                                 content[start:end], count=1)
+                content = content[:start] + segment + content[end:]
+        return content, id_map
+
+    hdr, char_map = remove_and_remap(hdr, "charPr", remove_char)
+    hdr, para_map = remove_and_remap(hdr, "paraPr", remove_para)
+    hdr = re.sub(r'(<hh:charProperties itemCnt=")\d+', rf'\g<1>{len(char_map)}', hdr)
+    hdr = re.sub(r'(<hh:paraProperties itemCnt=")\d+', rf'\g<1>{len(para_map)}', hdr)
+
+    def remap(content, attr, id_map):
+        return re.sub(rf'{attr}="(\d+)"',
+                      lambda m: f'{attr}="{id_map.get(m.group(1), m.group(1))}"', content)
+
+    hdr = remap(remap(hdr, "charPrIDRef", char_map), "paraPrIDRef", para_map)
+    sections = [remap(remap(c, "charPrIDRef", char_map), "paraPrIDRef", para_map)
+                for c in sections]
+    return hdr, sections
+
+
+class TestTrimMatchesOriginalAlgorithm(unittest.TestCase):
+    """The single forward pass must produce the same header and sections as
+    the original splice-per-entry trim for a real document."""
+
+    def test_sample_report(self):
+        with open(SAMPLE_CONFIG, encoding="utf-8") as f:
+            config = json.load(f)
+        template = G._load_template(TEMPLATE)
+        sm = template.xml.style_map()
+        sections = [G._render_section(copy.deepcopy(sec), sm, template.xml)
+                    for sec in config["sections"]]
+        header = template.xml.header
+
+        hdr, trimmed = G._trim_unused_styles_xml(header, sections)
+        ref_hdr, ref_sections = ref_trim(header, sections)
+        self.assertLess(len(hdr), len(header))
+        self.assertEqual(hdr, ref_hdr)
+        self.assertEqual(trimmed, ref_sections)
+
+
+# ============================================================================
+# secCnt substitution
+# ============================================================================
+
+class TestHeaderSecCnt(unittest.TestCase):
+    """Every secCnt attribute is set, as the original re.sub did."""
+
+    def test_bundled_template(self):
+        tx = G._TemplateXml(_template_header(), {})
+        hdr = tx.header_with_sec_cnt(4)
+        self.assertEqual(re.findall(r'secCnt="(\d+)"', hdr), ["4"])
+        self.assertEqual(hdr, re.sub(r'secCnt="\d+"', 'secCnt="4"', tx.header))
+        # The cached split serves later documents with other counts.
+        self.assertEqual(re.findall(r'secCnt="(\d+)"', tx.header_with_sec_cnt(2)), ["2"])
+
+    def test_every_match_replaced(self):
+        header = '<hh:head secCnt="1"><hh:x secCnt="1"/><hh:y secCnt="12"/></hh:head>'
+        tx = G._TemplateXml(header, {})
+        self.assertEqual(tx.header_with_sec_cnt(3),
+                         '<hh:head secCnt="3"><hh:x secCnt="3"/><hh:y secCnt="3"/></hh:head>')
+
+    def test_no_sec_cnt_leaves_header_unchanged(self):
+        header = '<hh:head version="1.4"></hh:head>'
+        self.assertEqual(G._TemplateXml(header, {}).header_with_sec_cnt(3), header)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Tests for the text width / greedy word-wrap estimators.
+
+estimate_text_width, estimate_line_breaks, estimate_line_count and
+_segmented_line_count run on per-height width tables and prefix sums; each is
+checked here against a straightforward character-by-character reference.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import generate_hwpx as G
+
+
+# ============================================================================
+# Reference implementation (kept deliberately naive)
+# ============================================================================
+
+def ref_char_width(ch, h, bold=False):
+    if '\uAC00' <= ch <= '\uD7A3':      # Korean syllables
+        return h
+    elif '\u3131' <= ch <= '\u318E':     # Korean jamo
+        return h
+    elif '\u2500' <= ch <= '\u257F':     # Box drawing
+        return h
+    elif '\uFF00' <= ch <= '\uFFEF':     # Fullwidth forms
+        return h
+    elif ord(ch) >= 0x2E80:              # CJK, symbols, astral
+        return h
+    elif ch == ' ':
+        return int(h * 0.25)
+    elif ch.isascii() and (ch.isalpha() or ch.isdigit()):
+        w = h * 0.50
+    else:
+        w = h * 0.55
+    return int(w * G.BOLD_WIDTH_FACTOR) if bold else int(w)
+
+
+def ref_line_breaks(chars, h, horzsize):
+    """Greedy wrap of (ch, bold) pairs: on overflow break after the last space
+    on the line, else at the overflowing character."""
+    if not chars:
+        return [0]
+    limit = int(horzsize * G.EFFECTIVE_WIDTH_RATIO)
+    breaks = [0]
+    width = 0
+    after_space = None
+    for i, (ch, bold) in enumerate(chars):
+        width += ref_char_width(ch, h, bold)
+        if ch == " ":
+            after_space = i + 1
+        if width > limit:
+            if after_space and after_space > breaks[-1]:
+                breaks.append(after_space)
+                width = sum(ref_char_width(c, h, b) for c, b in chars[after_space:i + 1])
+            elif i > breaks[-1]:
+                breaks.append(i)
+                width = ref_char_width(ch, h, bold)
+            after_space = None
+    return breaks
+
+
+def _plain(text):
+    return [(ch, False) for ch in text]
+
+
+# ============================================================================
+# Estimators vs. reference
+# ============================================================================
+
+CASES = {
+    "empty": "",
+    "ascii_short": "Hello, world!",
+    "ascii_long": "The quick brown fox jumps over the lazy dog. " * 6,
+    "hangul_short": "추진 배경",
+    "hangul_long": "코딩 교육 플랫폼을 활용한 인재 양성 사업의 추진 현황과 향후 계획을 보고합니다. " * 4,
+    "mixed": "2025년 SW중심대학 (총 58개교) 선정 결과 ─ 예산 1,234억 원, 참여율 95% 달성 " * 3,
+    "astral": "이모지 😀 와 수학 문자 𝔘𝔫𝔦 그리고 𠀀𠀁 한자 " * 5,
+    "long_word_ascii": "x" * 400,
+    "long_word_hangul": "가" * 120,
+    "long_word_then_text": "A" * 150 + " 이후 이어지는 짧은 문장",
+    "spaces_only": " " * 300,
+    "leading_trailing_spaces": "   앞뒤 공백이 있는 문장   " * 8,
+}
+HEIGHTS = (1000, 1500, 2400)
+HORZSIZES = (48188, 20000, 1500)
+
+
+class TestAgainstReference(unittest.TestCase):
+    """Width, breaks and line counts must equal the reference for every
+    case, height and line width."""
+
+    def test_text_width(self):
+        for name, text in CASES.items():
+            for h in HEIGHTS:
+                with self.subTest(case=name, h=h):
+                    self.assertEqual(G.estimate_text_width(text, h),
+                                     sum(ref_char_width(c, h) for c in text))
+
+    def test_line_breaks_and_count(self):
+        for name, text in CASES.items():
+            for h in HEIGHTS:
+                for hz in HORZSIZES:
+                    with self.subTest(case=name, h=h, horzsize=hz):
+                        expected = ref_line_breaks(_plain(text), h, hz)
+                        self.assertEqual(G.estimate_line_breaks(text, h, hz), expected)
+                        self.assertEqual(G.estimate_line_count(text, h, hz), len(expected))
+
+    def test_segmented_line_count(self):
+        for name, text in CASES.items():
+            # Alternate bold/normal in 7-character segments.
+            segments = [(text[i:i + 7], (i // 7) % 2 == 1) for i in range(0, len(text), 7)]
+            chars = [(ch, bold) for seg, bold in segments for ch in seg]
+            for hz in HORZSIZES:
+                with self.subTest(case=name, horzsize=hz):
+                    self.assertEqual(G._segmented_line_count(segments, 1500, hz),
+                                     len(ref_line_breaks(chars, 1500, hz)))
+
+    def test_cases_cover_wrapping(self):
+        # Guard the fixtures: some cases must wrap, and the long-word cases
+        # must break mid-word (no space to wrap at).
+        self.assertGreater(len(ref_line_breaks(_plain(CASES["hangul_long"]), 1500, 48188)), 1)
+        breaks = ref_line_breaks(_plain(CASES["long_word_ascii"]), 1500, 48188)
+        self.assertGreater(len(breaks), 1)
+        self.assertNotIn(" ", CASES["long_word_ascii"])
+
+    def test_random_text(self):
+        rng = random.Random(20260529)
+        alphabet = "가나다라 마바사 ㅇㄱᄀ□ abcXYZ 0123 .,!?()─ＡＢ漢字 é·※😀𝔘  "
+        for n in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.choice((1, 30, 80, 250))))
+            h = rng.choice(HEIGHTS)
+            hz = rng.choice(HORZSIZES)
+            with self.subTest(n=n):
+                expected = ref_line_breaks(_plain(text), h, hz)
+                self.assertEqual(G.estimate_line_breaks(text, h, hz), expected)
+                self.assertEqual(G.estimate_text_width(text, h),
+                                 sum(ref_char_width(c, h) for c in text))
+
+    def test_lineseg_textpos_follow_breaks(self):
+        text = CASES["mixed"]
+        breaks = ref_line_breaks(_plain(text), 1500, 48188)
+        xml = G.lineseg_xml(vertsize=1500, textheight=1500, baseline=1275, spacing=900,
+                            num_lines=len(breaks), full_text=text)
+        for tp in breaks:
+            self.assertIn(f'textpos="{tp}"', xml)
+
+
+if __name__ == "__main__":
+    unittest.main()
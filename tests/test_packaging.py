@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Tests for package assembly:
+  - Section rendering (deterministic, in order)
+  - In-memory template cache invalidation
+  - ZIP members (validity, passthrough members intact)
+  - content.hpf timestamps (UTC)
+"""
+
+import copy
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import generate_hwpx as G
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(SKILL_DIR, "assets", "template.hwpx")
+
+
+def _multi_section_config(n=6):
+    return {
+        "title": "패키지 테스트",
+        "sections": [{
+            "type": "appendix" if i % 3 == 2 else "body",
+            "title_bar": f"섹션 {i}",
+            "appendix_title": f"붙임 제목 {i}",
+            "content": [
+                {"type": "heading", "text": f"항목 {i}"},
+                {"type": "bullet", "text": "추진 현황 " * (i + 1)},
+                {"type": "dash", "text": "세부 내용"},
+            ],
+        } for i in range(n)],
+    }
+
+
+def _generated_xml(config, out_dir):
+    """{member: text} of the rebuilt XML members (no timestamps inside)."""
+    out = os.path.join(out_dir, "out.hwpx")
+    G.generate_hwpx(copy.deepcopy(config), out)
+    with zipfile.ZipFile(out) as zf:
+        return {n: zf.read(n).decode("utf-8") for n in zf.namelist()
+                if re.fullmatch(r"Contents/(header|section\d+)\.xml", n)}
+
+
+# ============================================================================
+# Section rendering
+# ============================================================================
+
+class TestSectionRendering(unittest.TestCase):
+    """Serial, in-order section rendering."""
+
+    def test_repeated_builds_are_byte_identical(self):
+        """Sections render serially, in order; building the same config twice
+        (the second time from warm caches) gives the same header and section
+        XML."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = _multi_section_config()
+        first = _generated_xml(config, tmp.name)
+        second = _generated_xml(config, tmp.name)
+        self.assertEqual(first, second)
+        for i in range(6):
+            self.assertIn(f"섹션 {i}", first[f"Contents/section{i}.xml"])
+
+
+# ============================================================================
+# Template cache
+# ============================================================================
+
+def _rewrite_template(path, edit):
+    """Rewrite the template at ``path``, passing each XML member's text
+    through ``edit(name, text)``."""
+    with zipfile.ZipFile(path) as src:
+        members = [(info, src.read(info)) for info in src.infolist()]
+    with zipfile.ZipFile(path, "w") as dst:
+        for info, data in members:
+            if info.filename.endswith(".xml"):
+                data = edit(info.filename, data.decode("utf-8")).encode("utf-8")
+            dst.writestr(info, data)
+
+
+class TestTemplateCache(unittest.TestCase):
+    """The parsed template is reused until the file on disk changes."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "template.hwpx")
+        shutil.copyfile(TEMPLATE, self.path)
+
+    def test_unchanged_template_is_reused(self):
+        self.assertIs(G._load_template(self.path), G._load_template(self.path))
+
+    def test_rewritten_template_is_reloaded(self):
+        old = G._load_template(self.path)
+        st = os.stat(self.path)
+
+        def edit(name, text):
+            if name == "Contents/header.xml":
+                return text.replace("<hh:head ", '<hh:head data-test="reloaded" ', 1)
+            if name == "Contents/section0.xml":
+                return text.replace("</hs:sec>", "<!-- reloaded --></hs:sec>", 1)
+            return text
+
+        _rewrite_template(self.path, edit)
+        # Bump mtime explicitly so coarse filesystem timestamps cannot hide
+        # the rewrite.
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+
+        new = G._load_template(self.path)
+        self.assertIsNot(new, old)
+        self.assertNotEqual(new.sha256, old.sha256)
+        self.assertIn('data-test="reloaded"', new.xml.header)
+        self.assertNotIn('data-test="reloaded"', old.xml.header)
+        self.assertIn("<!-- reloaded -->", new.xml.sections["Contents/section0.xml"])
+        self.assertIn(b"<!-- reloaded -->", new.members["Contents/section0.xml"])
+
+        # The next document is built from the rewritten header.
+        out = os.path.join(os.path.dirname(self.path), "out.hwpx")
+        G.generate_hwpx(_multi_section_config(1), out, template_path=self.path,
+                        line_spacing_band="165")  # bypasses the shared style cache
+        with zipfile.ZipFile(out) as zf:
+            self.assertIn(b'data-test="reloaded"', zf.read("Contents/header.xml"))
+
+
+# ============================================================================
+# Package members
+# ============================================================================
+
+class TestPackageMembers(unittest.TestCase):
+    """The output ZIP is valid and template members come through unchanged."""
+
+    def test_archive_valid_and_passthrough_members_intact(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        out = os.path.join(tmp.name, "out.hwpx")
+        G.generate_hwpx(_multi_section_config(2), out)
+        with zipfile.ZipFile(TEMPLATE) as src, zipfile.ZipFile(out) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist()[0], "mimetype")
+            self.assertEqual(zf.getinfo("mimetype").compress_type, zipfile.ZIP_STORED)
+            # Preview/PrvText.txt is rebuilt per document; the rest is copied.
+            copied = [n for n in src.namelist()
+                      if not n.endswith("/") and G._is_passthrough(n)
+                      and n != "Preview/PrvText.txt"]
+            self.assertTrue(any(n.startswith("BinData/") for n in copied))
+            for name in copied:
+                with self.subTest(member=name):
+                    self.assertEqual(zf.read(name), src.read(name))
+
+
+# ============================================================================
+# content.hpf timestamps
+# ============================================================================
+
+class TestContentHpfTimestamp(unittest.TestCase):
+    """CreatedDate/ModifiedDate are written in UTC."""
+
+    def _dates(self, **kw):
+        hpf = G.generate_content_hpf(1, False, **kw)
+        return re.findall(r'name="(?:CreatedDate|ModifiedDate)" content="text">([^<]*)<', hpf)
+
+    def test_aware_timestamp_converted_to_utc(self):
+        kst = timezone(timedelta(hours=9))
+        ts = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=kst)
+        self.assertEqual(self._dates(timestamp=ts), ["2026-03-01T00:30:15Z"] * 2)
+
+    def test_naive_timestamp_taken_as_local_time(self):
+        ts = datetime(2026, 3, 1, 9, 30, 15)
+        expected = ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.assertEqual(self._dates(timestamp=ts), [expected] * 2)
+
+    def test_default_is_current_utc_time(self):
+        before = datetime.now(timezone.utc).replace(microsecond=0)
+        (created, _modified) = self._dates()
+        after = datetime.now(timezone.utc)
+        stamp = datetime.strptime(created, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        self.assertTrue(before <= stamp <= after)
+
+
+if __name__ == "__main__":
+    unittest.main()